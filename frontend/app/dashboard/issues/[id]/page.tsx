@@ -39,7 +39,7 @@ export default function IssuePage({ params }: { params: { id: string } }) {
   const { data: issue, isLoading: issueLoading, error: issueError, refetch: refetchIssue } = useIssue(params.id)
 
   // Fetch comments
-  const { data: comments, isLoading: commentsLoading, refetch: refetchComments } = useComments(params.id, 50, 0)
+  const { data: comments, isLoading: commentsLoading, refetch: refetchComments } = useComments(params.id, 50)
 
   // Create comment mutation
   const { mutate: createComment, isLoading: isCreatingComment } = useCreateComment(params.id)
@@ -185,8 +185,9 @@ export function useCreateSubtask(issueId: string) {
 
 // ==================== Comment Hooks ====================
 
-export function useComments(issueId: string | null, limit = 50, offset = 0) {
-  return useQuery((token) => api.comments.getIssueComments(issueId!, limit, offset, token), {
+// Lists are cursor-paginated: pass the X-Next-Cursor header of the previous page
+export function useComments(issueId: string | null, limit = 50, cursor?: string) {
+  return useQuery((token) => api.comments.getIssueComments(issueId!, limit, cursor, token), {
     enabled: !!issueId,
   })
 }
@@ -197,8 +198,8 @@ export function useCreateComment(issueId: string) {
 
 // ==================== Notification Hooks ====================
 
-export function useNotifications(limit = 50, offset = 0, unreadOnly = false) {
-  return useQuery((token) => api.notifications.getNotifications(limit, offset, unreadOnly, token))
+export function useNotifications(limit = 50, cursor?: string, unreadOnly = false) {
+  return useQuery((token) => api.notifications.getNotifications(limit, cursor, unreadOnly, token))
 }
 
 export function useUnreadCount() {
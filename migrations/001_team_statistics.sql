@@ -0,0 +1,135 @@
+-- Team statistics computed in one round trip (FR-082)
+-- Returns every TeamStatisticsResponse field as JSON. Trends are bucketed
+-- with date_trunc by day or week over the last p_days days; zero buckets
+-- are included so charts need no client-side gap filling.
+
+CREATE OR REPLACE FUNCTION get_team_statistics(
+    p_team_id UUID,
+    p_days INTEGER DEFAULT 30,
+    p_bucket TEXT DEFAULT 'day'
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_since TIMESTAMPTZ;
+    v_step INTERVAL;
+    v_result JSONB;
+BEGIN
+    IF p_bucket NOT IN ('day', 'week') THEN
+        RAISE EXCEPTION 'Invalid bucket: %', p_bucket;
+    END IF;
+
+    v_since := date_trunc(p_bucket, NOW() - make_interval(days => p_days));
+    v_step := ('1 ' || p_bucket)::INTERVAL;
+
+    WITH team_issues AS (
+        SELECT i.id, i.project_id, i.assignee_user_id, i.status, i.created_at, i.updated_at
+        FROM issues i
+        JOIN projects p ON p.id = i.project_id
+        WHERE p.team_id = p_team_id
+          AND p.deleted_at IS NULL
+          AND i.deleted_at IS NULL
+    ),
+    -- Completion time is the last recorded move to Done, else the last update
+    completed AS (
+        SELECT ti.id, ti.assignee_user_id,
+               COALESCE(
+                   (SELECT MAX(h.created_at) FROM issue_history h
+                    WHERE h.issue_id = ti.id
+                      AND h.field_name = 'status'
+                      AND h.new_value = 'Done'),
+                   ti.updated_at
+               ) AS completed_at
+        FROM team_issues ti
+        WHERE ti.status = 'Done'
+    ),
+    buckets AS (
+        SELECT generate_series(v_since, date_trunc(p_bucket, NOW()), v_step) AS bucket
+    ),
+    created_per_bucket AS (
+        SELECT date_trunc(p_bucket, created_at) AS bucket, COUNT(*) AS count
+        FROM team_issues
+        WHERE created_at >= v_since
+        GROUP BY 1
+    ),
+    completed_per_bucket AS (
+        SELECT date_trunc(p_bucket, completed_at) AS bucket, COUNT(*) AS count
+        FROM completed
+        WHERE completed_at >= v_since
+        GROUP BY 1
+    ),
+    assigned_per_member AS (
+        SELECT assignee_user_id AS user_id, COUNT(*) AS count
+        FROM team_issues
+        WHERE assignee_user_id IS NOT NULL
+        GROUP BY 1
+    ),
+    completed_per_member AS (
+        SELECT assignee_user_id AS user_id, COUNT(*) AS count
+        FROM completed
+        WHERE assignee_user_id IS NOT NULL AND completed_at >= v_since
+        GROUP BY 1
+    ),
+    issues_per_project AS (
+        SELECT project_id,
+               COUNT(*) AS count,
+               COUNT(*) FILTER (WHERE status = 'Done') AS done_count
+        FROM team_issues
+        GROUP BY 1
+    ),
+    members AS (
+        SELECT tm.user_id, up.name AS user_name
+        FROM team_members tm
+        JOIN user_profiles up ON up.id = tm.user_id
+        WHERE tm.team_id = p_team_id
+    )
+    SELECT jsonb_build_object(
+        'issue_creation_trend', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                'date', b.bucket::DATE,
+                'count', COALESCE(c.count, 0)
+            ) ORDER BY b.bucket), '[]'::JSONB)
+            FROM buckets b
+            LEFT JOIN created_per_bucket c ON c.bucket = b.bucket
+        ),
+        'issue_completion_trend', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                'date', b.bucket::DATE,
+                'count', COALESCE(c.count, 0)
+            ) ORDER BY b.bucket), '[]'::JSONB)
+            FROM buckets b
+            LEFT JOIN completed_per_bucket c ON c.bucket = b.bucket
+        ),
+        'issues_by_member', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                'user_id', m.user_id,
+                'user_name', m.user_name,
+                'count', COALESCE(a.count, 0)
+            ) ORDER BY COALESCE(a.count, 0) DESC, m.user_name), '[]'::JSONB)
+            FROM members m
+            LEFT JOIN assigned_per_member a ON a.user_id = m.user_id
+        ),
+        'completed_by_member', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                'user_id', m.user_id,
+                'user_name', m.user_name,
+                'count', COALESCE(c.count, 0)
+            ) ORDER BY COALESCE(c.count, 0) DESC, m.user_name), '[]'::JSONB)
+            FROM members m
+            LEFT JOIN completed_per_member c ON c.user_id = m.user_id
+        ),
+        'issues_by_project', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                'project_id', p.id,
+                'project_name', p.name,
+                'count', COALESCE(c.count, 0),
+                'done_count', COALESCE(c.done_count, 0)
+            ) ORDER BY COALESCE(c.count, 0) DESC, p.name), '[]'::JSONB)
+            FROM projects p
+            LEFT JOIN issues_per_project c ON c.project_id = p.id
+            WHERE p.team_id = p_team_id AND p.deleted_at IS NULL
+        )
+    ) INTO v_result;
+
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql STABLE;
@@ -0,0 +1,75 @@
+-- Composite and partial indexes matched to the hot query shapes
+-- Every list is read "filter by owner, skip soft-deleted rows, newest first",
+-- so the indexes lead with the filter column, carry the sort keys
+-- (created_at, id) used by cursor pagination, and are partial on
+-- deleted_at IS NULL so soft-deleted rows never occupy index pages.
+-- Check the resulting plans with scripts/check_index_usage.sql.
+
+-- Issues: project issue list and project dashboard (FR-031, FR-080)
+-- status and priority are included so the dashboard counts are an
+-- index-only scan
+CREATE INDEX IF NOT EXISTS idx_issues_project_active_created
+    ON issues(project_id, created_at DESC, id DESC)
+    INCLUDE (status, priority)
+    WHERE deleted_at IS NULL;
+
+-- Issues: upcoming due issues on the project dashboard (FR-080)
+CREATE INDEX IF NOT EXISTS idx_issues_project_active_due
+    ON issues(project_id, due_date)
+    WHERE deleted_at IS NULL AND due_date IS NOT NULL;
+
+-- Issues: assigned issues on the personal dashboard (FR-081)
+CREATE INDEX IF NOT EXISTS idx_issues_assignee_active_created
+    ON issues(assignee_user_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
+-- Issues: due-soon window on the personal dashboard (FR-081)
+CREATE INDEX IF NOT EXISTS idx_issues_assignee_active_due
+    ON issues(assignee_user_id, due_date)
+    WHERE deleted_at IS NULL AND due_date IS NOT NULL;
+
+-- Comments: comment list, oldest first (FR-061)
+CREATE INDEX IF NOT EXISTS idx_comments_issue_active_created
+    ON comments(issue_id, created_at, id)
+    WHERE deleted_at IS NULL;
+
+-- Comments: recent comments on the personal dashboard (FR-081)
+CREATE INDEX IF NOT EXISTS idx_comments_user_active_created
+    ON comments(user_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
+-- Notifications: notification list (FR-090)
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created
+    ON notifications(user_id, created_at DESC, id DESC);
+
+-- Notifications: unread-only list and unread count (FR-090)
+CREATE INDEX IF NOT EXISTS idx_notifications_user_unread_created
+    ON notifications(user_id, created_at DESC, id DESC)
+    WHERE is_read = FALSE;
+
+-- Activity logs: team activity log (FR-019)
+CREATE INDEX IF NOT EXISTS idx_activity_logs_team_created
+    ON activity_logs(team_id, created_at DESC, id DESC);
+
+-- Projects: team project list (FR-021)
+CREATE INDEX IF NOT EXISTS idx_projects_team_active_created
+    ON projects(team_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
+-- Project favorites: a user's favorites (FR-027)
+CREATE INDEX IF NOT EXISTS idx_project_favorites_user_id
+    ON project_favorites(user_id);
+
+-- Issue labels: label deletion cascades and issues-by-label lookups
+CREATE INDEX IF NOT EXISTS idx_issue_labels_label_id
+    ON issue_labels(label_id);
+
+-- Superseded by the indexes above; low-selectivity columns such as
+-- deleted_at and is_read only add write cost on their own
+DROP INDEX IF EXISTS idx_issues_deleted_at;
+DROP INDEX IF EXISTS idx_comments_deleted_at;
+DROP INDEX IF EXISTS idx_notifications_user_id;
+DROP INDEX IF EXISTS idx_notifications_is_read;
+DROP INDEX IF EXISTS idx_activity_logs_team_id;
+DROP INDEX IF EXISTS idx_activity_logs_created_at;
+DROP INDEX IF EXISTS idx_projects_deleted_at;
@@ -0,0 +1,129 @@
+-- Denormalized counters kept exact by triggers
+-- projects.issue_count   issues not soft-deleted
+-- teams.member_count     team_members rows
+-- issues.subtask_count   subtasks rows
+-- issues.comment_count   comments not soft-deleted
+-- Counts are read with the parent row, so list endpoints need no count
+-- queries or embedded aggregates.
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS issue_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS member_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS subtask_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
+-- Counter functions run as the owner: the row that changes the count
+-- (an issue, a comment, a membership) may be written by a user who
+-- cannot update the parent row itself under RLS.
+
+CREATE OR REPLACE FUNCTION maintain_project_issue_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' AND NEW.deleted_at IS NULL THEN
+        UPDATE projects SET issue_count = issue_count + 1 WHERE id = NEW.project_id;
+    ELSIF TG_OP = 'DELETE' AND OLD.deleted_at IS NULL THEN
+        UPDATE projects SET issue_count = issue_count - 1 WHERE id = OLD.project_id;
+    ELSIF TG_OP = 'UPDATE' AND OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL THEN
+        UPDATE projects SET issue_count = issue_count - 1 WHERE id = NEW.project_id;
+    ELSIF TG_OP = 'UPDATE' AND OLD.deleted_at IS NOT NULL AND NEW.deleted_at IS NULL THEN
+        UPDATE projects SET issue_count = issue_count + 1 WHERE id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION maintain_issue_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' AND NEW.deleted_at IS NULL THEN
+        UPDATE issues SET comment_count = comment_count + 1 WHERE id = NEW.issue_id;
+    ELSIF TG_OP = 'DELETE' AND OLD.deleted_at IS NULL THEN
+        UPDATE issues SET comment_count = comment_count - 1 WHERE id = OLD.issue_id;
+    ELSIF TG_OP = 'UPDATE' AND OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL THEN
+        UPDATE issues SET comment_count = comment_count - 1 WHERE id = NEW.issue_id;
+    ELSIF TG_OP = 'UPDATE' AND OLD.deleted_at IS NOT NULL AND NEW.deleted_at IS NULL THEN
+        UPDATE issues SET comment_count = comment_count + 1 WHERE id = NEW.issue_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION maintain_issue_subtask_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE issues SET subtask_count = subtask_count + 1 WHERE id = NEW.issue_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE issues SET subtask_count = subtask_count - 1 WHERE id = OLD.issue_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION maintain_team_member_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE teams SET member_count = member_count + 1 WHERE id = NEW.team_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE teams SET member_count = member_count - 1 WHERE id = OLD.team_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS issues_project_issue_count ON issues;
+CREATE TRIGGER issues_project_issue_count
+    AFTER INSERT OR DELETE OR UPDATE OF deleted_at ON issues
+    FOR EACH ROW EXECUTE FUNCTION maintain_project_issue_count();
+
+DROP TRIGGER IF EXISTS comments_issue_comment_count ON comments;
+CREATE TRIGGER comments_issue_comment_count
+    AFTER INSERT OR DELETE OR UPDATE OF deleted_at ON comments
+    FOR EACH ROW EXECUTE FUNCTION maintain_issue_comment_count();
+
+DROP TRIGGER IF EXISTS subtasks_issue_subtask_count ON subtasks;
+CREATE TRIGGER subtasks_issue_subtask_count
+    AFTER INSERT OR DELETE ON subtasks
+    FOR EACH ROW EXECUTE FUNCTION maintain_issue_subtask_count();
+
+DROP TRIGGER IF EXISTS team_members_team_member_count ON team_members;
+CREATE TRIGGER team_members_team_member_count
+    AFTER INSERT OR DELETE ON team_members
+    FOR EACH ROW EXECUTE FUNCTION maintain_team_member_count();
+
+-- A counter change is not an edit: keep updated_at untouched when only
+-- counters change, since it is shown to users and used as a fallback
+-- completion time by get_team_statistics
+DROP TRIGGER IF EXISTS update_teams_updated_at ON teams;
+CREATE TRIGGER update_teams_updated_at BEFORE UPDATE ON teams
+    FOR EACH ROW
+    WHEN (to_jsonb(OLD) - 'member_count' - 'updated_at'
+          IS DISTINCT FROM to_jsonb(NEW) - 'member_count' - 'updated_at')
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_projects_updated_at ON projects;
+CREATE TRIGGER update_projects_updated_at BEFORE UPDATE ON projects
+    FOR EACH ROW
+    WHEN (to_jsonb(OLD) - 'issue_count' - 'updated_at'
+          IS DISTINCT FROM to_jsonb(NEW) - 'issue_count' - 'updated_at')
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_issues_updated_at ON issues;
+CREATE TRIGGER update_issues_updated_at BEFORE UPDATE ON issues
+    FOR EACH ROW
+    WHEN (to_jsonb(OLD) - 'subtask_count' - 'comment_count' - 'updated_at'
+          IS DISTINCT FROM to_jsonb(NEW) - 'subtask_count' - 'comment_count' - 'updated_at')
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Backfill existing rows
+UPDATE projects p SET issue_count = (
+    SELECT count(*) FROM issues i WHERE i.project_id = p.id AND i.deleted_at IS NULL
+);
+UPDATE teams t SET member_count = (
+    SELECT count(*) FROM team_members m WHERE m.team_id = t.id
+);
+UPDATE issues i SET
+    subtask_count = (SELECT count(*) FROM subtasks s WHERE s.issue_id = i.id),
+    comment_count = (
+        SELECT count(*) FROM comments c WHERE c.issue_id = i.id AND c.deleted_at IS NULL
+    );
@@ -0,0 +1,67 @@
+-- Per-user notification read watermark and unread counter (FR-090, FR-091)
+-- A notification is read when its own is_read flag is set or when it was
+-- created at or before the user's last_read_at. Mark-all-read moves the
+-- watermark and zeroes the counter in one row, and the unread count is a
+-- single-row read; is_read remains as a per-item override.
+
+CREATE TABLE IF NOT EXISTS notification_read_state (
+    user_id UUID PRIMARY KEY REFERENCES user_profiles(id) ON DELETE CASCADE,
+    last_read_at TIMESTAMPTZ,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE notification_read_state ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own read state" ON notification_read_state;
+CREATE POLICY "Users can view own read state" ON notification_read_state
+    FOR SELECT USING (user_id = auth.uid());
+
+DROP POLICY IF EXISTS "Users can insert own read state" ON notification_read_state;
+CREATE POLICY "Users can insert own read state" ON notification_read_state
+    FOR INSERT WITH CHECK (user_id = auth.uid());
+
+DROP POLICY IF EXISTS "Users can update own read state" ON notification_read_state;
+CREATE POLICY "Users can update own read state" ON notification_read_state
+    FOR UPDATE USING (user_id = auth.uid());
+
+DROP TRIGGER IF EXISTS update_notification_read_state_updated_at ON notification_read_state;
+CREATE TRIGGER update_notification_read_state_updated_at BEFORE UPDATE ON notification_read_state
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Keeps unread_count equal to the notifications that are neither flagged
+-- read nor covered by the watermark. The conditional updates take the
+-- state row lock, so they serialize with a concurrent mark-all-read and
+-- re-check the watermark it set.
+CREATE OR REPLACE FUNCTION maintain_notification_unread_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' AND NOT COALESCE(NEW.is_read, FALSE) THEN
+        INSERT INTO notification_read_state AS s (user_id, unread_count)
+        VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET unread_count = s.unread_count + 1
+        WHERE s.last_read_at IS NULL OR s.last_read_at < NEW.created_at;
+    ELSIF TG_OP = 'UPDATE' AND NOT COALESCE(OLD.is_read, FALSE) AND COALESCE(NEW.is_read, FALSE) THEN
+        UPDATE notification_read_state SET unread_count = unread_count - 1
+        WHERE user_id = NEW.user_id
+          AND (last_read_at IS NULL OR last_read_at < NEW.created_at);
+    ELSIF TG_OP = 'DELETE' AND NOT COALESCE(OLD.is_read, FALSE) THEN
+        UPDATE notification_read_state SET unread_count = unread_count - 1
+        WHERE user_id = OLD.user_id
+          AND (last_read_at IS NULL OR last_read_at < OLD.created_at);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS notifications_unread_count ON notifications;
+CREATE TRIGGER notifications_unread_count
+    AFTER INSERT OR DELETE OR UPDATE OF is_read ON notifications
+    FOR EACH ROW EXECUTE FUNCTION maintain_notification_unread_count();
+
+-- Backfill existing users
+INSERT INTO notification_read_state (user_id, unread_count)
+SELECT user_id, count(*) FILTER (WHERE NOT COALESCE(is_read, FALSE))
+FROM notifications
+GROUP BY user_id
+ON CONFLICT (user_id) DO NOTHING;
@@ -0,0 +1,50 @@
+-- Durable email outbox (FR-003, FR-013)
+-- Requests only insert a row; the outbox worker claims due rows in
+-- batches, sends them and records the outcome. Failed sends are retried
+-- with exponential backoff until max attempts, then marked failed.
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    to_email VARCHAR(255) NOT NULL,
+    subject TEXT NOT NULL,
+    html_content TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMPTZ,
+    last_error TEXT,
+    sent_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Only rows the worker can still pick up
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+    ON email_outbox(next_attempt_at)
+    WHERE status IN ('pending', 'sending');
+
+-- Written and read with the service role only
+ALTER TABLE email_outbox ENABLE ROW LEVEL SECURITY;
+
+-- Claim up to p_limit due emails for one worker. SKIP LOCKED lets several
+-- workers claim concurrently without sending the same row twice; a row
+-- whose lease expired (worker died mid-send) becomes claimable again.
+CREATE OR REPLACE FUNCTION claim_email_outbox(
+    p_limit INTEGER DEFAULT 50,
+    p_lease_seconds INTEGER DEFAULT 300
+)
+RETURNS SETOF email_outbox AS $$
+    UPDATE email_outbox o
+    SET status = 'sending',
+        attempts = o.attempts + 1,
+        locked_until = NOW() + make_interval(secs => p_lease_seconds)
+    WHERE o.id IN (
+        SELECT id FROM email_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'sending' AND locked_until < NOW())
+        ORDER BY next_attempt_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING o.*;
+$$ LANGUAGE sql;
@@ -0,0 +1,19 @@
+-- Content-addressed AI result cache (FR-040, FR-041)
+-- cache_key is a SHA-256 of (operation, model, prompt inputs), so a result
+-- is only reused for exactly the same request; editing an issue changes
+-- its key instead of leaving a stale entry behind. This is the persistent
+-- tier behind each worker's in-process LRU.
+
+CREATE TABLE IF NOT EXISTS ai_result_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    operation VARCHAR(50) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    result TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- For pruning old entries
+CREATE INDEX IF NOT EXISTS idx_ai_result_cache_created_at ON ai_result_cache(created_at);
+
+-- Written and read with the service role only
+ALTER TABLE ai_result_cache ENABLE ROW LEVEL SECURITY;
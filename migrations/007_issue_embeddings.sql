@@ -0,0 +1,19 @@
+-- Issue embeddings for semantic duplicate detection (FR-044)
+-- One vector per issue, computed from title + description when the issue
+-- is written. content_hash covers the model and the embedded text, so an
+-- unchanged issue is never embedded twice.
+
+CREATE TABLE IF NOT EXISTS issue_embeddings (
+    issue_id UUID PRIMARY KEY REFERENCES issues(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    content_hash CHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    embedding REAL[] NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_issue_embeddings_project
+    ON issue_embeddings(project_id);
+
+-- Written and read with the service role only
+ALTER TABLE issue_embeddings ENABLE ROW LEVEL SECURITY;
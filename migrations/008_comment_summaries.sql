@@ -0,0 +1,85 @@
+-- Incremental comment summaries (FR-045)
+-- A thread is summarized as a sequence of chunks: each chunk covers a
+-- fixed (created_at, id) range of comments and keeps its own summary.
+-- The issue's summary combines the chunk summaries with the comments
+-- after the last chunk, so a refresh only reads and summarizes what
+-- changed. Triggers on comments invalidate both levels.
+
+CREATE TABLE IF NOT EXISTS comment_summaries (
+    issue_id UUID PRIMARY KEY REFERENCES issues(id) ON DELETE CASCADE,
+    summary TEXT,  -- NULL until generated, and again after any comment change
+    model VARCHAR(100),
+    version INTEGER NOT NULL DEFAULT 0,  -- bumped on every invalidation
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS comment_summary_chunks (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    issue_id UUID NOT NULL REFERENCES issues(id) ON DELETE CASCADE,
+    start_created_at TIMESTAMPTZ NOT NULL,
+    start_id UUID NOT NULL,
+    end_created_at TIMESTAMPTZ NOT NULL,
+    end_id UUID NOT NULL,
+    summary TEXT,  -- NULL when a comment in the range changed
+    model VARCHAR(100),
+    version INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    -- A range is sealed once even if two refreshes race to seal it;
+    -- also serves the per-issue chunk listing
+    UNIQUE (issue_id, start_created_at, start_id)
+);
+
+-- Written and read with the service role only
+ALTER TABLE comment_summaries ENABLE ROW LEVEL SECURITY;
+ALTER TABLE comment_summary_chunks ENABLE ROW LEVEL SECURITY;
+
+-- Any comment change drops the issue summary. New comments sort after
+-- every chunk; edits and deletes also drop the chunk covering the comment.
+-- version lets a refresh that raced with a change skip saving its result.
+CREATE OR REPLACE FUNCTION invalidate_comment_summary()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed comments%ROWTYPE;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+
+    INSERT INTO comment_summaries (issue_id, version)
+    VALUES (changed.issue_id, 1)
+    ON CONFLICT (issue_id) DO UPDATE
+        SET summary = NULL,
+            version = comment_summaries.version + 1,
+            updated_at = NOW();
+
+    IF TG_OP <> 'INSERT' THEN
+        UPDATE comment_summary_chunks
+        SET summary = NULL, version = version + 1
+        WHERE issue_id = changed.issue_id
+          AND (start_created_at, start_id) <= (changed.created_at, changed.id)
+          AND (changed.created_at, changed.id) <= (end_created_at, end_id);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS invalidate_comment_summary_on_insert_delete ON comments;
+CREATE TRIGGER invalidate_comment_summary_on_insert_delete
+    AFTER INSERT OR DELETE ON comments
+    FOR EACH ROW EXECUTE FUNCTION invalidate_comment_summary();
+
+DROP TRIGGER IF EXISTS invalidate_comment_summary_on_update ON comments;
+CREATE TRIGGER invalidate_comment_summary_on_update
+    AFTER UPDATE ON comments
+    FOR EACH ROW
+    WHEN (OLD.content IS DISTINCT FROM NEW.content
+          OR OLD.deleted_at IS DISTINCT FROM NEW.deleted_at)
+    EXECUTE FUNCTION invalidate_comment_summary();
+
+-- Issues that already have comments start with an empty summary row
+INSERT INTO comment_summaries (issue_id)
+SELECT DISTINCT issue_id FROM comments
+ON CONFLICT (issue_id) DO NOTHING;
@@ -0,0 +1,168 @@
+-- Index usage check for the hot endpoint queries
+-- Runs EXPLAIN ANALYZE for the SQL each list/dashboard endpoint sends and
+-- fails unless the plan reads the expected index (index or index-only scan)
+-- with no sequential scan and no explicit Sort.
+--
+-- Usage, against a local database with database_schema.sql and
+-- migrations/ applied:
+--     psql -v ON_ERROR_STOP=1 -d <database> -f scripts/check_index_usage.sql
+--
+-- Sequential scans are disabled for the session so that small development
+-- datasets still show which index the planner can use; a query that has no
+-- usable index still falls back to a Seq Scan and fails the check.
+
+\set QUIET on
+\pset tuples_only on
+
+BEGIN;
+
+SET LOCAL enable_seqscan = off;
+
+CREATE FUNCTION pg_temp.assert_index_scan(
+    p_label TEXT,
+    p_query TEXT,
+    p_index TEXT
+)
+RETURNS VOID AS $$
+DECLARE
+    v_plan JSONB;
+    v_nodes TEXT[];
+    v_indexes TEXT[];
+BEGIN
+    EXECUTE 'EXPLAIN (ANALYZE, FORMAT JSON) ' || p_query INTO v_plan;
+
+    SELECT array_agg(DISTINCT n #>> '{}') INTO v_nodes
+    FROM jsonb_path_query(v_plan, 'strict $.**."Node Type"') AS n;
+    SELECT array_agg(DISTINCT n #>> '{}') INTO v_indexes
+    FROM jsonb_path_query(v_plan, 'strict $.**."Index Name"') AS n;
+
+    IF 'Seq Scan' = ANY(v_nodes) THEN
+        RAISE EXCEPTION '%: sequential scan (nodes: %)', p_label, v_nodes;
+    END IF;
+    IF v_indexes IS NULL OR NOT p_index = ANY(v_indexes) THEN
+        RAISE EXCEPTION '%: expected index %, plan used %', p_label, p_index, v_indexes;
+    END IF;
+    IF ('Sort' = ANY(v_nodes) OR 'Incremental Sort' = ANY(v_nodes)) THEN
+        RAISE EXCEPTION '%: plan sorts instead of reading in index order (nodes: %)', p_label, v_nodes;
+    END IF;
+
+    RAISE NOTICE 'ok  %  (% via %)', p_label, v_nodes, v_indexes;
+END;
+$$ LANGUAGE plpgsql;
+
+-- FR-031: project issue list, first page and a deep page
+SELECT pg_temp.assert_index_scan('issues: project list',
+    $q$SELECT * FROM issues
+       WHERE project_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+       ORDER BY created_at DESC, id DESC LIMIT 51$q$,
+    'idx_issues_project_active_created');
+
+SELECT pg_temp.assert_index_scan('issues: project list, cursor page',
+    $q$SELECT * FROM issues
+       WHERE project_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+         AND created_at <= '2024-01-01T00:00:00+00:00'
+         AND (created_at < '2024-01-01T00:00:00+00:00'
+              OR (created_at = '2024-01-01T00:00:00+00:00'
+                  AND id < '00000000-0000-0000-0000-000000000009'))
+       ORDER BY created_at DESC, id DESC LIMIT 51$q$,
+    'idx_issues_project_active_created');
+
+-- FR-080: project dashboard
+SELECT pg_temp.assert_index_scan('issues: dashboard status and priority',
+    $q$SELECT status, priority FROM issues
+       WHERE project_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL$q$,
+    'idx_issues_project_active_created');
+
+SELECT pg_temp.assert_index_scan('issues: dashboard upcoming due',
+    $q$SELECT * FROM issues
+       WHERE project_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+         AND due_date >= CURRENT_DATE AND due_date <= CURRENT_DATE + 7
+       ORDER BY due_date LIMIT 5$q$,
+    'idx_issues_project_active_due');
+
+-- FR-081: personal dashboard
+SELECT pg_temp.assert_index_scan('issues: assigned to me',
+    $q$SELECT * FROM issues
+       WHERE assignee_user_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+       ORDER BY created_at DESC LIMIT 20$q$,
+    'idx_issues_assignee_active_created');
+
+SELECT pg_temp.assert_index_scan('issues: due soon',
+    $q$SELECT * FROM issues
+       WHERE assignee_user_id = '00000000-0000-0000-0000-000000000001'
+         AND due_date >= CURRENT_DATE AND due_date <= CURRENT_DATE + 7
+         AND deleted_at IS NULL
+       ORDER BY due_date LIMIT 50$q$,
+    'idx_issues_assignee_active_due');
+
+SELECT pg_temp.assert_index_scan('comments: my recent comments',
+    $q$SELECT * FROM comments
+       WHERE user_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+       ORDER BY created_at DESC LIMIT 5$q$,
+    'idx_comments_user_active_created');
+
+-- FR-061: comment list
+SELECT pg_temp.assert_index_scan('comments: issue comments',
+    $q$SELECT * FROM comments
+       WHERE issue_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+       ORDER BY created_at, id LIMIT 51$q$,
+    'idx_comments_issue_active_created');
+
+-- FR-090: notifications
+SELECT pg_temp.assert_index_scan('notifications: list',
+    $q$SELECT * FROM notifications
+       WHERE user_id = '00000000-0000-0000-0000-000000000001'
+       ORDER BY created_at DESC, id DESC LIMIT 51$q$,
+    'idx_notifications_user_created');
+
+SELECT pg_temp.assert_index_scan('notifications: unread only',
+    $q$SELECT * FROM notifications
+       WHERE user_id = '00000000-0000-0000-0000-000000000001'
+         AND is_read = FALSE
+       ORDER BY created_at DESC, id DESC LIMIT 51$q$,
+    'idx_notifications_user_unread_created');
+
+-- Unread list past the mark-all-read watermark; the unread count itself
+-- is read from notification_read_state
+SELECT pg_temp.assert_index_scan('notifications: unread after watermark',
+    $q$SELECT * FROM notifications
+       WHERE user_id = '00000000-0000-0000-0000-000000000001'
+         AND is_read = FALSE
+         AND created_at > '2024-01-01T00:00:00+00:00'
+       ORDER BY created_at DESC, id DESC LIMIT 51$q$,
+    'idx_notifications_user_unread_created');
+
+-- FR-019: team activity log
+SELECT pg_temp.assert_index_scan('activity_logs: team activity',
+    $q$SELECT * FROM activity_logs
+       WHERE team_id = '00000000-0000-0000-0000-000000000001'
+       ORDER BY created_at DESC, id DESC LIMIT 51$q$,
+    'idx_activity_logs_team_created');
+
+-- FR-021: team project list
+SELECT pg_temp.assert_index_scan('projects: team projects',
+    $q$SELECT * FROM projects
+       WHERE team_id = '00000000-0000-0000-0000-000000000001'
+         AND deleted_at IS NULL
+       ORDER BY created_at DESC$q$,
+    'idx_projects_team_active_created');
+
+SELECT pg_temp.assert_index_scan('project_favorites: my favorites',
+    $q$SELECT project_id FROM project_favorites
+       WHERE user_id = '00000000-0000-0000-0000-000000000001'$q$,
+    'idx_project_favorites_user_id');
+
+-- FR-038: issues carrying a label
+SELECT pg_temp.assert_index_scan('issue_labels: by label',
+    $q$SELECT issue_id FROM issue_labels
+       WHERE label_id = '00000000-0000-0000-0000-000000000001'$q$,
+    'idx_issue_labels_label_id');
+
+ROLLBACK;
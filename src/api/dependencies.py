@@ -1,9 +1,38 @@
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from src.config import settings
+from src.database.repository import get_db
 from src.database.supabase import get_supabase
+from src.services.cache import TTLCache, create_cache
+from src.services.jwt_verifier import jwt_verifier, TokenVerificationError
+from typing import Optional
 from uuid import UUID
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Short-lived user profile cache keyed by user id
+profile_cache = TTLCache(
+    maxsize=settings.PROFILE_CACHE_SIZE,
+    ttl=settings.PROFILE_CACHE_TTL
+)
+
+# Team membership cache keyed by (user_id, team_id)
+membership_cache = create_cache(
+    "team_membership",
+    maxsize=settings.MEMBERSHIP_CACHE_SIZE,
+    ttl=settings.MEMBERSHIP_CACHE_TTL
+)
+
+def _membership_key(user_id: str, team_id: str) -> str:
+    return f"{user_id}:{team_id}"
+
+async def invalidate_team_membership(user_id: str, team_id: str):
+    """
+    Drop a cached membership after it was created, changed or removed.
+    """
+    await membership_cache.delete(_membership_key(str(user_id), str(team_id)))
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -11,31 +40,72 @@ async def get_current_user(
     """
     Dependency to get current authenticated user from token.
     """
-    try:
-        supabase = get_supabase()
-        token = credentials.credentials
+    return await authenticate_token(credentials.credentials)
 
-        # Get user from Supabase
-        user_response = supabase.auth.get_user(token)
+async def get_stream_user(
+    access_token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> dict:
+    """
+    Dependency for streaming endpoints. Browsers cannot set headers on an
+    EventSource, so the token may also be passed as ?access_token=.
+    """
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    return await authenticate_token(token)
 
-        if not user_response or not user_response.user:
+async def authenticate_token(token: str) -> dict:
+    """
+    Resolve an access token to the user's profile.
+    The token is verified locally when key material is available; the
+    Supabase Auth API is only called as a fallback.
+    """
+    try:
+        try:
+            claims = jwt_verifier.verify(token)
+        except TokenVerificationError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials"
             )
 
-        # Get user profile
-        profile_response = supabase.table("user_profiles").select("*").eq(
-            "id", str(user_response.user.id)
-        ).is_("deleted_at", "null").execute()
+        if claims is not None:
+            user_id = claims["sub"]
+        else:
+            # Get user from Supabase
+            supabase = get_supabase()
+            user_response = await run_in_threadpool(supabase.auth.get_user, token)
 
-        if not profile_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User profile not found"
-            )
+            if not user_response or not user_response.user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication credentials"
+                )
 
-        return profile_response.data[0]
+            user_id = str(user_response.user.id)
+
+        profile = profile_cache.get(user_id)
+        if profile is None:
+            # Get user profile
+            db = get_db()
+            profile_response = await db.table("user_profiles").select("*").eq(
+                "id", user_id
+            ).is_("deleted_at", "null").execute()
+
+            if not profile_response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User profile not found"
+                )
+
+            profile = profile_response.data[0]
+            profile_cache.set(user_id, profile)
+
+        return dict(profile)
 
     except HTTPException:
         raise
@@ -54,19 +124,27 @@ async def verify_team_membership(
     FR-070: Team Membership Verification
     """
     try:
-        supabase = get_supabase()
+        key = _membership_key(current_user["id"], str(team_id))
+        membership = await membership_cache.get(key)
+        if membership is not None:
+            return membership
+
+        db = get_db()
 
-        membership = supabase.table("team_members").select("*").eq(
+        result = await db.table("team_members").select("*").eq(
             "team_id", str(team_id)
         ).eq("user_id", current_user["id"]).execute()
 
-        if not membership.data:
+        if not result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Team not found or access denied"
             )
 
-        return membership.data[0]
+        membership = result.data[0]
+        await membership_cache.set(key, membership)
+
+        return membership
 
     except HTTPException:
         raise
@@ -110,20 +188,43 @@ async def verify_team_owner(
 
     return membership
 
+async def _cache_fetched_membership(
+    current_user: dict,
+    team_id: str,
+    memberships: list
+) -> dict:
+    """
+    Check the membership rows embedded in an entity query and cache the result.
+    """
+    if not memberships:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found or access denied"
+        )
+
+    membership = memberships[0]
+    await membership_cache.set(_membership_key(current_user["id"], team_id), membership)
+
+    return membership
+
 async def verify_project_access(
     project_id: UUID,
     current_user: dict = Depends(get_current_user)
 ) -> dict:
     """
     Verify that current user has access to the specified project.
+    The project and the caller's membership are fetched in one query;
+    the membership is returned under the "membership" key.
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        # Get project and verify team membership
-        project = supabase.table("projects").select(
-            "*, teams!inner(id)"
-        ).eq("id", str(project_id)).is_("deleted_at", "null").execute()
+        # Get project with the caller's team membership embedded
+        project = await db.table("projects").select(
+            "*, teams!inner(id, team_members(*))"
+        ).eq("id", str(project_id)).eq(
+            "teams.team_members.user_id", current_user["id"]
+        ).is_("deleted_at", "null").execute()
 
         if not project.data:
             raise HTTPException(
@@ -132,10 +233,13 @@ async def verify_project_access(
             )
 
         # Verify team membership
-        team_id = project.data[0]["team_id"]
-        await verify_team_membership(UUID(team_id), current_user)
+        project_data = project.data[0]
+        team = project_data.pop("teams")
+        project_data["membership"] = await _cache_fetched_membership(
+            current_user, project_data["team_id"], team["team_members"]
+        )
 
-        return project.data[0]
+        return project_data
 
     except HTTPException:
         raise
@@ -151,14 +255,18 @@ async def verify_issue_access(
 ) -> dict:
     """
     Verify that current user has access to the specified issue.
+    The issue, its project and the caller's membership are fetched in one
+    query; the membership is returned under the "membership" key.
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        # Get issue with project info
-        issue = supabase.table("issues").select(
-            "*, projects!inner(id, team_id)"
-        ).eq("id", str(issue_id)).is_("deleted_at", "null").execute()
+        # Get issue with project info and the caller's team membership embedded
+        issue = await db.table("issues").select(
+            "*, projects!inner(id, team_id, teams!inner(id, team_members(*)))"
+        ).eq("id", str(issue_id)).eq(
+            "projects.teams.team_members.user_id", current_user["id"]
+        ).is_("deleted_at", "null").execute()
 
         if not issue.data:
             raise HTTPException(
@@ -167,10 +275,13 @@ async def verify_issue_access(
             )
 
         # Verify team membership
-        team_id = issue.data[0]["projects"]["team_id"]
-        await verify_team_membership(UUID(team_id), current_user)
+        issue_data = issue.data[0]
+        team = issue_data["projects"].pop("teams")
+        issue_data["membership"] = await _cache_fetched_membership(
+            current_user, issue_data["projects"]["team_id"], team["team_members"]
+        )
 
-        return issue.data[0]
+        return issue_data
 
     except HTTPException:
         raise
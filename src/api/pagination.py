@@ -0,0 +1,74 @@
+import base64
+import json
+from dateutil.parser import isoparse
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, Response, status
+
+# Header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(row: dict) -> str:
+    """Build an opaque cursor from the (created_at, id) key of a row."""
+    raw = json.dumps([row["created_at"], row["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Return the (created_at, id) key of a cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Re-serialize both parts so only well-formed values reach the filter
+        return isoparse(created_at).isoformat(), str(UUID(row_id))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def paginate(
+    query,
+    response: Response,
+    limit: int,
+    cursor: Optional[str] = None,
+    desc: bool = True
+) -> List[dict]:
+    """
+    Fetch one page of a query using keyset pagination on (created_at, id).
+    The next cursor is returned in the X-Next-Cursor response header, so
+    every page costs an index seek instead of skipping over earlier rows.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        op = "lt" if desc else "gt"
+        # The plain range bound lets the index seek straight to the page;
+        # the row comparison below only breaks ties on created_at
+        if desc:
+            query = query.lte("created_at", created_at)
+        else:
+            query = query.gte("created_at", created_at)
+        query = query.or_(
+            f'created_at.{op}."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.{op}.{row_id})'
+        )
+
+    # Both sort keys go in one order param; this client repeats the param
+    # per call and PostgREST honours only one of them
+    direction = ".desc" if desc else ""
+    # Fetch one extra row to know whether another page exists
+    result = await query.order(
+        f"created_at{direction},id", desc=desc
+    ).limit(limit + 1).execute()
+
+    rows = result.data[:limit]
+    if len(result.data) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1])
+
+    return rows
@@ -1,58 +1,151 @@
-from fastapi import APIRouter, HTTPException, Depends
-from src.models.schemas import AIGenerateResponse
-from src.database.supabase import get_supabase
-from src.api.dependencies import get_current_user, verify_issue_access
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from src.models.schemas import AIGenerateResponse, AIBatchLabelRequest, AIBatchLabelResponse
+from src.database.repository import get_db
+from src.api.dependencies import get_current_user, verify_issue_access, verify_project_access
+from src.api.sse import SSE_HEADERS, format_sse
 from src.services.ai_service import AIService
+from src.services.ai_cache import ai_cache
+from src.services.comment_summary import CommentSummarizer
+from src.services.duplicate_index import duplicate_index
+from src.services.semantic_index import semantic_index, issue_text
+from src.services.single_flight import SingleFlight
+from typing import Optional
 from uuid import UUID
+import asyncio
 
 router = APIRouter()
 ai_service = AIService()
+comment_summarizer = CommentSummarizer(ai_service)
+ai_flights = SingleFlight("ai")
+
+# How often a pending AI call checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Labels per issue (see Data Limits in README)
+MAX_LABELS_PER_ISSUE = 5
+
+async def _cancel_on_disconnect(request: Request, coro):
+    """
+    Await an AI call, cancelling it if the client disconnects first so the
+    provider request and its concurrency slot are released.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        task.cancel()
+
+async def _get_issue_for_generation(issue_id: UUID, current_user: dict) -> dict:
+    """
+    Fetch an issue the caller can access and check its description is long
+    enough to generate from.
+    """
+    issue = await verify_issue_access(issue_id, current_user)
+
+    # Check description length
+    if not issue.get("description") or len(issue["description"]) <= 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Issue description must be more than 10 characters"
+        )
+
+    return issue
+
+async def _store_result(issue_id: UUID, field: str, key: str, operation: str, result: str):
+    """
+    Save a generated result in the AI cache and on the issue for display.
+    """
+    if ai_service.model:
+        await ai_cache.set(key, operation, ai_service.model, result)
+
+    db = get_db()
+    await db.table("issues").update({
+        field: result,
+        f"{field}_cached_at": "now()"
+    }).eq("id", str(issue_id)).execute()
+
+async def _generate_and_store(issue_id: UUID, field: str, key: str, operation: str, generate) -> str:
+    """
+    Generate and store a result. Concurrent requests for the same issue,
+    operation and input share one LLM call.
+    """
+    async def run():
+        result = await generate()
+        await _store_result(issue_id, field, key, operation, result)
+        return result
+
+    return await ai_flights.do((str(issue_id), operation, key), run)
+
+def _stream_generation(
+    issue_id: UUID,
+    field: str,
+    key: str,
+    operation: str,
+    cached_result: str = None,
+    deltas=None
+):
+    """
+    SSE response forwarding generated text as "token" events, ending with a
+    "done" event carrying the full result. The result is stored only once
+    the stream completes.
+    """
+    async def events():
+        if cached_result is not None:
+            yield format_sse("done", {"result": cached_result, "cached": True})
+            return
+
+        parts = []
+        try:
+            async for delta in deltas:
+                parts.append(delta)
+                yield format_sse("token", {"text": delta})
+
+            result = "".join(parts).strip()
+            await _store_result(issue_id, field, key, operation, result)
+
+            yield format_sse("done", {"result": result, "cached": False})
+        except Exception as e:
+            yield format_sse("error", {"detail": str(e)})
+        finally:
+            await deltas.aclose()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 @router.post("/issues/{issue_id}/summary", response_model=AIGenerateResponse)
 async def generate_summary(
     issue_id: UUID,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     """
     FR-040: AI Summary Generation
     """
     try:
-        await verify_issue_access(issue_id, current_user)
-        supabase = get_supabase()
-
-        # Check rate limit
-        await ai_service.check_rate_limit(current_user["id"])
+        issue = await _get_issue_for_generation(issue_id, current_user)
 
-        # Get issue
-        issue = supabase.table("issues").select("*").eq(
-            "id", str(issue_id)
-        ).single().execute()
-
-        # Check description length
-        if not issue.data.get("description") or len(issue.data["description"]) <= 10:
-            raise HTTPException(
-                status_code=400,
-                detail="Issue description must be more than 10 characters"
-            )
-
-        # Check if cached
-        if issue.data.get("ai_summary") and issue.data.get("ai_summary_cached_at"):
+        # Cached results for this exact input are served before rate limiting
+        key = ai_service.summary_cache_key(issue["description"])
+        cached = await ai_cache.get(key)
+        if cached is not None:
             return {
-                "result": issue.data["ai_summary"],
+                "result": cached,
                 "cached": True
             }
 
-        # Generate summary
-        summary = await ai_service.generate_summary(issue.data["description"])
-
-        # Cache result
-        supabase.table("issues").update({
-            "ai_summary": summary,
-            "ai_summary_cached_at": "now()"
-        }).eq("id", str(issue_id)).execute()
+        # Check rate limit
+        await ai_service.check_rate_limit(current_user["id"])
 
-        # Increment rate limit counter
-        await ai_service.increment_rate_limit(current_user["id"])
+        # Generate summary
+        summary = await _cancel_on_disconnect(request, _generate_and_store(
+            issue_id, "ai_summary", key, "summary",
+            lambda: ai_service.generate_summary(issue["description"])
+        ))
 
         return {
             "result": summary,
@@ -64,54 +157,65 @@ async def generate_summary(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.post("/issues/{issue_id}/suggestion", response_model=AIGenerateResponse)
-async def generate_suggestion(
+@router.post("/issues/{issue_id}/summary/stream")
+async def stream_summary(
     issue_id: UUID,
     current_user: dict = Depends(get_current_user)
 ):
     """
-    FR-041: AI Solution Suggestion
+    FR-040: AI Summary Generation - streamed over Server-Sent Events
     """
     try:
-        await verify_issue_access(issue_id, current_user)
-        supabase = get_supabase()
+        issue = await _get_issue_for_generation(issue_id, current_user)
+
+        # Cached results for this exact input are served before rate limiting
+        key = ai_service.summary_cache_key(issue["description"])
+        cached = await ai_cache.get(key)
+        if cached is not None:
+            return _stream_generation(issue_id, "ai_summary", key, "summary", cached_result=cached)
 
         # Check rate limit
         await ai_service.check_rate_limit(current_user["id"])
 
-        # Get issue
-        issue = supabase.table("issues").select("*").eq(
-            "id", str(issue_id)
-        ).single().execute()
+        return _stream_generation(
+            issue_id, "ai_summary", key, "summary",
+            deltas=ai_service.stream_summary(issue["description"])
+        )
 
-        # Check description length
-        if not issue.data.get("description") or len(issue.data["description"]) <= 10:
-            raise HTTPException(
-                status_code=400,
-                detail="Issue description must be more than 10 characters"
-            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/issues/{issue_id}/suggestion", response_model=AIGenerateResponse)
+async def generate_suggestion(
+    issue_id: UUID,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    FR-041: AI Solution Suggestion
+    """
+    try:
+        issue = await _get_issue_for_generation(issue_id, current_user)
 
-        # Check if cached
-        if issue.data.get("ai_suggestion") and issue.data.get("ai_suggestion_cached_at"):
+        # Cached results for this exact input are served before rate limiting
+        key = ai_service.suggestion_cache_key(issue["title"], issue["description"])
+        cached = await ai_cache.get(key)
+        if cached is not None:
             return {
-                "result": issue.data["ai_suggestion"],
+                "result": cached,
                 "cached": True
             }
 
-        # Generate suggestion
-        suggestion = await ai_service.generate_suggestion(
-            issue.data["title"],
-            issue.data["description"]
-        )
-
-        # Cache result
-        supabase.table("issues").update({
-            "ai_suggestion": suggestion,
-            "ai_suggestion_cached_at": "now()"
-        }).eq("id", str(issue_id)).execute()
+        # Check rate limit
+        await ai_service.check_rate_limit(current_user["id"])
 
-        # Increment rate limit counter
-        await ai_service.increment_rate_limit(current_user["id"])
+        # Generate suggestion
+        suggestion = await _cancel_on_disconnect(request, _generate_and_store(
+            issue_id, "ai_suggestion", key, "suggestion",
+            lambda: ai_service.generate_suggestion(issue["title"], issue["description"])
+        ))
 
         return {
             "result": suggestion,
@@ -123,9 +227,40 @@ async def generate_suggestion(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/issues/{issue_id}/suggestion/stream")
+async def stream_suggestion(
+    issue_id: UUID,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    FR-041: AI Solution Suggestion - streamed over Server-Sent Events
+    """
+    try:
+        issue = await _get_issue_for_generation(issue_id, current_user)
+
+        # Cached results for this exact input are served before rate limiting
+        key = ai_service.suggestion_cache_key(issue["title"], issue["description"])
+        cached = await ai_cache.get(key)
+        if cached is not None:
+            return _stream_generation(issue_id, "ai_suggestion", key, "suggestion", cached_result=cached)
+
+        # Check rate limit
+        await ai_service.check_rate_limit(current_user["id"])
+
+        return _stream_generation(
+            issue_id, "ai_suggestion", key, "suggestion",
+            deltas=ai_service.stream_suggestion(issue["title"], issue["description"])
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/issues/{issue_id}/labels/suggest")
 async def suggest_labels(
     issue_id: UUID,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -133,20 +268,20 @@ async def suggest_labels(
     """
     try:
         await verify_issue_access(issue_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
         # Check rate limit
         await ai_service.check_rate_limit(current_user["id"])
 
         # Get issue with project labels
-        issue = supabase.table("issues").select(
+        issue = await db.table("issues").select(
             "*, projects!inner(id)"
         ).eq("id", str(issue_id)).single().execute()
 
         project_id = issue.data["project_id"]
 
         # Get available labels
-        labels = supabase.table("labels").select("*").eq(
+        labels = await db.table("labels").select("*").eq(
             "project_id", project_id
         ).execute()
 
@@ -154,16 +289,94 @@ async def suggest_labels(
             return {"recommended_labels": []}
 
         # Generate recommendations
-        recommended = await ai_service.recommend_labels(
+        recommended = await _cancel_on_disconnect(request, ai_service.recommend_labels(
             issue.data["title"],
             issue.data.get("description", ""),
             labels.data
+        ))
+
+        return {"recommended_labels": recommended}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/projects/{project_id}/labels/suggest", response_model=AIBatchLabelResponse)
+async def suggest_labels_batch(
+    project_id: UUID,
+    batch: AIBatchLabelRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    FR-043: AI Auto-Label - many issues at once
+    Labels the given issues, or every unlabelled issue in the project,
+    with as few LLM calls as the token budget allows. With apply, the
+    recommended labels are added to the issues in one bulk insert.
+    """
+    try:
+        await verify_project_access(project_id, current_user)
+        db = get_db()
+
+        issues_query = db.table("issues").select(
+            "id, title, description, issue_labels(label_id)"
+        ).eq("project_id", str(project_id)).is_("deleted_at", "null")
+        if batch.issue_ids is not None:
+            issues_query = issues_query.in_("id", [str(i) for i in batch.issue_ids])
+
+        labels, issues = await asyncio.gather(
+            db.table("labels").select("id, name").eq("project_id", str(project_id)).execute(),
+            issues_query.execute()
         )
 
-        # Increment rate limit counter
-        await ai_service.increment_rate_limit(current_user["id"])
+        targets = issues.data
+        if batch.issue_ids is None:
+            targets = [issue for issue in targets if not issue["issue_labels"]]
 
-        return {"recommended_labels": recommended}
+        if not labels.data or not targets:
+            return {"results": [], "applied": 0}
+
+        # Check rate limit
+        await ai_service.check_rate_limit(current_user["id"])
+
+        # Generate recommendations
+        recommended = await _cancel_on_disconnect(
+            request, ai_service.recommend_labels_batch(targets, labels.data)
+        )
+
+        # Only labels the issue does not have yet are suggested
+        existing = {
+            issue["id"]: {row["label_id"] for row in issue["issue_labels"]}
+            for issue in targets
+        }
+        recommended = {
+            issue_id: [label_id for label_id in label_ids if label_id not in existing.get(issue_id, set())]
+            for issue_id, label_ids in recommended.items()
+        }
+
+        applied = 0
+        if batch.apply:
+            # Applied labels stay within the per-issue limit
+            rows = [
+                {"issue_id": issue_id, "label_id": label_id}
+                for issue_id, label_ids in recommended.items()
+                for label_id in label_ids[:max(0, MAX_LABELS_PER_ISSUE - len(existing.get(issue_id, ())))]
+            ]
+            if rows:
+                # Labels added concurrently since the read are skipped
+                result = await db.table("issue_labels").upsert(
+                    rows, on_conflict="issue_id,label_id", ignore_duplicates=True
+                ).execute()
+                applied = len(result.data)
+
+        return {
+            "results": [
+                {"issue_id": issue["id"], "recommended_labels": recommended.get(issue["id"], [])}
+                for issue in targets
+            ],
+            "applied": applied
+        }
 
     except HTTPException:
         raise
@@ -174,27 +387,29 @@ async def suggest_labels(
 async def detect_duplicates(
     project_id: UUID,
     title: str,
+    description: Optional[str] = None,
+    mode: str = "lexical",
     current_user: dict = Depends(get_current_user)
 ):
     """
     FR-044: AI Duplicate Detection
+    mode "lexical" matches shared title words; "semantic" compares
+    embeddings of title + description and also finds paraphrases.
     """
     try:
-        supabase = get_supabase()
+        if mode not in ("lexical", "semantic"):
+            raise HTTPException(status_code=400, detail="mode must be 'lexical' or 'semantic'")
+
+        await verify_project_access(project_id, current_user)
 
         # Check rate limit
         await ai_service.check_rate_limit(current_user["id"])
 
-        # Get existing issues
-        issues = supabase.table("issues").select("id, title, description").eq(
-            "project_id", str(project_id)
-        ).is_("deleted_at", "null").execute()
-
         # Find similar issues
-        similar = await ai_service.detect_duplicates(title, issues.data)
-
-        # Increment rate limit counter
-        await ai_service.increment_rate_limit(current_user["id"])
+        if mode == "semantic":
+            similar = await semantic_index.find_similar(project_id, issue_text(title, description))
+        else:
+            similar = await duplicate_index.find_similar(project_id, title)
 
         return {"similar_issues": similar}
 
@@ -206,34 +421,38 @@ async def detect_duplicates(
 @router.post("/issues/{issue_id}/comments/summarize", response_model=AIGenerateResponse)
 async def summarize_comments(
     issue_id: UUID,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     """
     FR-045: AI Comment Summary
     """
     try:
-        await verify_issue_access(issue_id, current_user)
-        supabase = get_supabase()
-
-        # Check rate limit
-        await ai_service.check_rate_limit(current_user["id"])
+        issue = await verify_issue_access(issue_id, current_user)
 
-        # Get comments
-        comments = supabase.table("comments").select("*").eq(
-            "issue_id", str(issue_id)
-        ).is_("deleted_at", "null").execute()
-
-        if len(comments.data) < 5:
+        if issue["comment_count"] < 5:
             raise HTTPException(
                 status_code=400,
                 detail="At least 5 comments required for summarization"
             )
 
-        # Generate summary
-        summary = await ai_service.summarize_comments(comments.data)
+        # Served without an LLM call until a comment changes
+        cached, version = await comment_summarizer.get_cached(issue_id)
+        if cached is not None:
+            return {
+                "result": cached,
+                "cached": True
+            }
+
+        # Check rate limit
+        await ai_service.check_rate_limit(current_user["id"])
 
-        # Increment rate limit counter
-        await ai_service.increment_rate_limit(current_user["id"])
+        # Fold new and changed comments into the summary; concurrent
+        # requests for the same thread state share one refresh
+        summary = await _cancel_on_disconnect(request, ai_flights.do(
+            (str(issue_id), "comment_summary", version),
+            lambda: comment_summarizer.refresh(issue_id, version)
+        ))
 
         return {
             "result": summary,
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from src.models.schemas import *
-from src.database.supabase import get_supabase
+from src.database.repository import get_db
+from src.api.pagination import paginate
 from src.api.dependencies import get_current_user, verify_issue_access
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 router = APIRouter()
@@ -16,9 +17,9 @@ async def create_comment(
     """FR-060: Create Comment"""
     try:
         await verify_issue_access(issue_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("comments").insert({
+        result = await db.table("comments").insert({
             "issue_id": str(issue_id),
             "user_id": current_user["id"],
             "content": comment_data.content
@@ -34,22 +35,21 @@ async def create_comment(
 @router.get("/issues/{issue_id}/comments", response_model=List[CommentResponse])
 async def get_issue_comments(
     issue_id: UUID,
+    response: Response,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """FR-061: Comment List"""
     try:
         await verify_issue_access(issue_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("comments").select(
+        query = db.table("comments").select(
             "*, user_profiles!inner(id, name, email, profile_image)"
-        ).eq("issue_id", str(issue_id)).is_("deleted_at", "null").order(
-            "created_at", desc=False
-        ).range(offset, offset + limit - 1).execute()
+        ).eq("issue_id", str(issue_id)).is_("deleted_at", "null")
 
-        return result.data
+        return await paginate(query, response, limit, cursor, desc=False)
 
     except HTTPException:
         raise
@@ -64,17 +64,17 @@ async def update_comment(
 ):
     """FR-062: Update Comment"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         # Verify ownership
-        comment = supabase.table("comments").select("user_id").eq(
+        comment = await db.table("comments").select("user_id").eq(
             "id", str(comment_id)
         ).single().execute()
 
         if comment.data["user_id"] != current_user["id"]:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        result = supabase.table("comments").update({
+        result = await db.table("comments").update({
             "content": comment_data.content
         }).eq("id", str(comment_id)).execute()
 
@@ -92,9 +92,9 @@ async def delete_comment(
 ):
     """FR-063: Delete Comment"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        supabase.table("comments").update({"deleted_at": "now()"}).eq(
+        await db.table("comments").update({"deleted_at": "now()"}).eq(
             "id", str(comment_id)
         ).execute()
 
@@ -1,168 +1,179 @@
 from fastapi import APIRouter, HTTPException, Depends
-from src.models.schemas import PersonalDashboardResponse, ProjectDashboardResponse
-from src.database.supabase import get_supabase
+from src.models.schemas import PersonalDashboardResponse, ProjectDashboardResponse, TeamStatisticsResponse
+from src.database.repository import get_db
 from src.api.dependencies import get_current_user, verify_project_access, verify_team_membership
+from src.services.single_flight import SingleFlight
+from typing import Optional
 from uuid import UUID
 from datetime import datetime, timedelta
+import asyncio
 
 router = APIRouter()
 
+# Cap on the due-soon window so heavy users get a bounded response
+DUE_SOON_LIMIT = 50
+
+dashboard_flights = SingleFlight("project_dashboard")
+
 @router.get("/personal")
 async def get_personal_dashboard(current_user: dict = Depends(get_current_user)):
     """
     FR-081: Personal Dashboard
     """
     try:
-        supabase = get_supabase()
-
-        # Get assigned issues
-        assigned_issues = supabase.table("issues").select("*").eq(
-            "assignee_user_id", current_user["id"]
-        ).is_("deleted_at", "null").order("created_at", desc=True).limit(20).execute()
-
-        # Get issues due soon (within 7 days)
-        due_soon_date = (datetime.utcnow() + timedelta(days=7)).date().isoformat()
-        due_soon = supabase.table("issues").select("*").eq(
-            "assignee_user_id", current_user["id"]
-        ).lte("due_date", due_soon_date).is_("deleted_at", "null").execute()
-
-        # Get issues due today
-        today = datetime.utcnow().date().isoformat()
-        due_today = supabase.table("issues").select("*").eq(
-            "assignee_user_id", current_user["id"]
-        ).eq("due_date", today).is_("deleted_at", "null").execute()
-
-        # Get recent comments
-        recent_comments = supabase.table("comments").select(
-            "*, issues!inner(title)"
-        ).eq("user_id", current_user["id"]).is_("deleted_at", "null").order(
-            "created_at", desc=True
-        ).limit(5).execute()
-
-        # Get my teams
-        teams = supabase.table("team_members").select(
-            "role, teams!inner(id, name, owner_id, created_at)"
-        ).eq("user_id", current_user["id"]).execute()
+        db = get_db()
+
+        today = datetime.utcnow().date()
+        due_soon_date = (today + timedelta(days=7)).isoformat()
+
+        # Independent reads run concurrently
+        assigned_issues, due_soon, recent_comments, teams = await asyncio.gather(
+            # Get assigned issues with the total count
+            db.table("issues").select("*", count="exact").eq(
+                "assignee_user_id", current_user["id"]
+            ).is_("deleted_at", "null").order("created_at", desc=True).limit(20).execute(),
+            # Get issues due soon (today through the next 7 days)
+            db.table("issues").select("*").eq(
+                "assignee_user_id", current_user["id"]
+            ).gte("due_date", today.isoformat()).lte(
+                "due_date", due_soon_date
+            ).is_("deleted_at", "null").order("due_date").limit(DUE_SOON_LIMIT).execute(),
+            # Get recent comments
+            db.table("comments").select(
+                "*, issues!inner(title)"
+            ).eq("user_id", current_user["id"]).is_("deleted_at", "null").order(
+                "created_at", desc=True
+            ).limit(5).execute(),
+            # Get my teams with member counts
+            db.table("team_members").select(
+                "role, teams!inner(id, name, owner_id, created_at, updated_at, member_count)"
+            ).eq("user_id", current_user["id"]).execute()
+        )
+
+        # Issues due today are the head of the due-soon window
+        due_today = [i for i in due_soon.data if i["due_date"] == today.isoformat()]
 
         return {
             "assigned_issues": assigned_issues.data,
-            "total_assigned": len(assigned_issues.data),
+            "total_assigned": assigned_issues.count,
             "due_soon": due_soon.data,
-            "due_today": due_today.data,
+            "due_today": due_today,
             "recent_comments": recent_comments.data,
-            "my_teams": [{"my_role": t["role"], **t["teams"]} for t in teams.data]
+            "my_teams": [
+                {"my_role": t["role"], **t["teams"]}
+                for t in teams.data
+            ]
         }
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/projects/{project_id}")
-async def get_project_dashboard(
-    project_id: UUID,
-    current_user: dict = Depends(get_current_user)
-):
+async def _load_project_dashboard(project_id: UUID) -> dict:
     """
-    FR-080: Project Dashboard
+    Aggregate the project dashboard. The result does not depend on who
+    asks, only on the project; access is checked per caller beforehand.
     """
-    try:
-        await verify_project_access(project_id, current_user)
-        supabase = get_supabase()
-
-        # Get issue counts by status
-        issues = supabase.table("issues").select("status").eq(
-            "project_id", str(project_id)
-        ).is_("deleted_at", "null").execute()
+    db = get_db()
 
-        status_counts = {}
-        for issue in issues.data:
-            status = issue["status"]
-            status_counts[status] = status_counts.get(status, 0) + 1
+    today = datetime.utcnow().date()
 
-        # Calculate completion rate
-        total = len(issues.data)
-        done_count = status_counts.get("Done", 0)
-        completion_rate = (done_count / total * 100) if total > 0 else 0
-
-        # Get issue counts by priority
-        priority_counts = {}
-        all_issues = supabase.table("issues").select("priority").eq(
+    # Independent reads run concurrently
+    issues, recent_issues, upcoming_due = await asyncio.gather(
+        # Status and priority of every issue, in one projected scan
+        db.table("issues").select("status, priority").eq(
             "project_id", str(project_id)
-        ).is_("deleted_at", "null").execute()
-
-        for issue in all_issues.data:
-            priority = issue["priority"]
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
+        ).is_("deleted_at", "null").execute(),
         # Get recent issues
-        recent_issues = supabase.table("issues").select("*").eq(
+        db.table("issues").select("*").eq(
             "project_id", str(project_id)
-        ).is_("deleted_at", "null").order("created_at", desc=True).limit(5).execute()
-
+        ).is_("deleted_at", "null").order("created_at", desc=True).limit(5).execute(),
         # Get upcoming due issues
-        upcoming_due = supabase.table("issues").select("*").eq(
+        db.table("issues").select("*").eq(
             "project_id", str(project_id)
         ).is_("deleted_at", "null").gte(
-            "due_date", datetime.utcnow().date().isoformat()
+            "due_date", today.isoformat()
         ).lte(
-            "due_date", (datetime.utcnow() + timedelta(days=7)).date().isoformat()
-        ).limit(5).execute()
+            "due_date", (today + timedelta(days=7)).isoformat()
+        ).order("due_date").limit(5).execute()
+    )
+
+    # Get issue counts by status and priority in a single pass
+    status_counts = {}
+    priority_counts = {}
+    for issue in issues.data:
+        status_counts[issue["status"]] = status_counts.get(issue["status"], 0) + 1
+        priority_counts[issue["priority"]] = priority_counts.get(issue["priority"], 0) + 1
+
+    # Calculate completion rate
+    total = len(issues.data)
+    done_count = status_counts.get("Done", 0)
+    completion_rate = (done_count / total * 100) if total > 0 else 0
+
+    return {
+        "issue_counts_by_status": status_counts,
+        "completion_rate": completion_rate,
+        "issue_counts_by_priority": priority_counts,
+        "recent_issues": recent_issues.data,
+        "upcoming_due_issues": upcoming_due.data
+    }
 
-        return {
-            "issue_counts_by_status": status_counts,
-            "completion_rate": completion_rate,
-            "issue_counts_by_priority": priority_counts,
-            "recent_issues": recent_issues.data,
-            "upcoming_due_issues": upcoming_due.data
-        }
+@router.get("/projects/{project_id}")
+async def get_project_dashboard(
+    project_id: UUID,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    FR-080: Project Dashboard
+    """
+    try:
+        await verify_project_access(project_id, current_user)
+
+        # Concurrent loads of the same project share one set of queries
+        return await dashboard_flights.do(
+            str(project_id), lambda: _load_project_dashboard(project_id)
+        )
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/teams/{team_id}/statistics")
+@router.get("/teams/{team_id}/statistics", response_model=TeamStatisticsResponse)
 async def get_team_statistics(
     team_id: UUID,
     period: str = "30",  # days
+    bucket: Optional[str] = None,  # "day" or "week"
     current_user: dict = Depends(get_current_user)
 ):
     """
     FR-082: Team Statistics
+    All statistics are aggregated in the database by one RPC call.
     """
     try:
         await verify_team_membership(team_id, current_user)
-        supabase = get_supabase()
 
-        # Get projects for this team
-        projects = supabase.table("projects").select("id").eq(
-            "team_id", str(team_id)
-        ).is_("deleted_at", "null").execute()
+        try:
+            days = int(period)
+        except ValueError:
+            days = 0
 
-        project_ids = [p["id"] for p in projects.data]
+        if not 1 <= days <= 365:
+            raise HTTPException(status_code=400, detail="Period must be between 1 and 365 days")
 
-        # Get issues by member
-        issues_by_member = []
-        members = supabase.table("team_members").select(
-            "user_id, user_profiles!inner(name)"
-        ).eq("team_id", str(team_id)).execute()
+        # Daily buckets for short periods, weekly otherwise
+        bucket = bucket or ("day" if days <= 31 else "week")
+        if bucket not in ("day", "week"):
+            raise HTTPException(status_code=400, detail="Bucket must be 'day' or 'week'")
 
-        for member in members.data:
-            count = supabase.table("issues").select("id", count="exact").in_(
-                "project_id", project_ids
-            ).eq("assignee_user_id", member["user_id"]).is_("deleted_at", "null").execute().count
+        db = get_db()
 
-            issues_by_member.append({
-                "user_name": member["user_profiles"]["name"],
-                "count": count
-            })
+        result = await db.rpc("get_team_statistics", {
+            "p_team_id": str(team_id),
+            "p_days": days,
+            "p_bucket": bucket
+        }).execute()
 
-        return {
-            "issue_creation_trend": [],  # Would implement with date grouping
-            "issue_completion_trend": [],  # Would implement with date grouping
-            "issues_by_member": issues_by_member,
-            "completed_by_member": [],  # Would implement similarly
-            "issues_by_project": []  # Would implement
-        }
+        return result.data
 
     except HTTPException:
         raise
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from src.models.schemas import *
-from src.database.supabase import get_supabase
+from src.database.repository import get_db
+from src.api.pagination import paginate
 from src.api.dependencies import get_current_user, verify_project_access
-from typing import List
+from src.services.duplicate_index import duplicate_index
+from src.services.semantic_index import semantic_index
+from typing import List, Optional
 from uuid import UUID
 
 router = APIRouter()
@@ -19,18 +22,14 @@ async def create_issue(
 ):
     """FR-030: Create Issue"""
     try:
-        await verify_project_access(project_id, current_user)
-        supabase = get_supabase()
+        project = await verify_project_access(project_id, current_user)
+        db = get_db()
 
         # Check issue limit (max 200 per project)
-        count = supabase.table("issues").select("id", count="exact").eq(
-            "project_id", str(project_id)
-        ).is_("deleted_at", "null").execute().count
-
-        if count >= 200:
+        if project["issue_count"] >= 200:
             raise HTTPException(status_code=400, detail="Maximum 200 issues per project")
 
-        result = supabase.table("issues").insert({
+        result = await db.table("issues").insert({
             "project_id": str(project_id),
             "title": issue_data.title,
             "description": issue_data.description,
@@ -41,7 +40,11 @@ async def create_issue(
             "status": "Backlog"
         }).execute()
 
-        return {**result.data[0], "subtask_count": 0, "comment_count": 0}
+        issue = result.data[0]
+        duplicate_index.add(project_id, issue["id"], issue["title"])
+        semantic_index.enqueue(issue)
+
+        return issue
 
     except HTTPException:
         raise
@@ -51,23 +54,31 @@ async def create_issue(
 @router.get("/projects/{project_id}/issues", response_model=List[IssueResponse])
 async def get_project_issues(
     project_id: UUID,
+    response: Response,
     status: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """FR-031: Issue Detail View & FR-036: Issue Search/Filtering"""
     try:
         await verify_project_access(project_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        query = supabase.table("issues").select("*").eq(
+        query = db.table("issues").select("*").eq(
             "project_id", str(project_id)
         ).is_("deleted_at", "null")
 
         if status:
             query = query.eq("status", status)
 
-        result = query.order("created_at", desc=True).execute()
-        return result.data
+        # Without limit or cursor the whole board is returned (projects hold
+        # at most 200 issues); pages are opt-in
+        if limit is None and cursor is None:
+            result = await query.order("created_at.desc,id", desc=True).execute()
+            return result.data
+
+        return await paginate(query, response, limit or 50, cursor)
 
     except HTTPException:
         raise
@@ -81,9 +92,9 @@ async def get_issue(
 ):
     """FR-031: Issue Detail View"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("issues").select("*").eq(
+        result = await db.table("issues").select("*").eq(
             "id", str(issue_id)
         ).is_("deleted_at", "null").single().execute()
 
@@ -100,14 +111,30 @@ async def update_issue(
 ):
     """FR-032: Update Issue"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         update_data = issue_data.dict(exclude_unset=True)
-        result = supabase.table("issues").update(update_data).eq(
+
+        # AI text shown on the issue no longer describes edited content
+        if "title" in update_data or "description" in update_data:
+            update_data.update({
+                "ai_summary": None,
+                "ai_summary_cached_at": None,
+                "ai_suggestion": None,
+                "ai_suggestion_cached_at": None
+            })
+
+        result = await db.table("issues").update(update_data).eq(
             "id", str(issue_id)
         ).execute()
 
-        return result.data[0]
+        issue = result.data[0]
+        if "title" in update_data:
+            duplicate_index.add(issue["project_id"], issue["id"], issue["title"])
+        if "title" in update_data or "description" in update_data:
+            semantic_index.enqueue(issue)
+
+        return issue
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -119,12 +146,16 @@ async def delete_issue(
 ):
     """FR-035: Delete Issue"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        supabase.table("issues").update({"deleted_at": "now()"}).eq(
+        result = await db.table("issues").update({"deleted_at": "now()"}).eq(
             "id", str(issue_id)
         ).execute()
 
+        for issue in result.data:
+            duplicate_index.remove(issue["project_id"], issue["id"])
+            semantic_index.remove(issue["project_id"], issue["id"])
+
         return {"message": "Issue deleted successfully"}
 
     except Exception as e:
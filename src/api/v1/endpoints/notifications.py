@@ -1,33 +1,69 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from src.config import settings
 from src.models.schemas import NotificationResponse
-from src.database.supabase import get_supabase
-from src.api.dependencies import get_current_user
-from typing import List
+from src.database.repository import get_db
+from src.api.pagination import paginate
+from src.api.sse import SSE_HEADERS, format_sse
+from src.api.dependencies import get_current_user, get_stream_user
+from src.services.notification_hub import notification_hub
+from src.services.notification_service import NotificationService
+from typing import List, Optional
 from uuid import UUID
+from dateutil.parser import isoparse
+import asyncio
 
 router = APIRouter()
+notification_service = NotificationService()
+
+async def _get_last_read_at(db, user_id: str) -> Optional[str]:
+    """Return the user's mark-all-read watermark, if any."""
+    state = await db.table("notification_read_state").select("last_read_at").eq(
+        "user_id", user_id
+    ).execute()
+    return state.data[0]["last_read_at"] if state.data else None
+
+def _apply_read_watermark(notification: dict, last_read_at: Optional[str]) -> dict:
+    """Mark a notification read if it is covered by the watermark."""
+    if (
+        not notification["is_read"]
+        and last_read_at
+        and isoparse(notification["created_at"]) <= isoparse(last_read_at)
+    ):
+        notification["is_read"] = True
+        notification["read_at"] = last_read_at
+    return notification
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     unread_only: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
     """FR-090: In-App Notification"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        query = supabase.table("notifications").select("*").eq(
+        query = db.table("notifications").select("*").eq(
             "user_id", current_user["id"]
-        ).order("created_at", desc=True)
+        )
 
         if unread_only:
+            # Unread means not flagged read and newer than the watermark
+            last_read_at = await _get_last_read_at(db, current_user["id"])
             query = query.eq("is_read", False)
+            if last_read_at:
+                query = query.gt("created_at", last_read_at)
+            notifications = await paginate(query, response, limit, cursor)
+        else:
+            notifications, last_read_at = await asyncio.gather(
+                paginate(query, response, limit, cursor),
+                _get_last_read_at(db, current_user["id"])
+            )
 
-        result = query.range(offset, offset + limit - 1).execute()
-
-        return result.data
+        return [_apply_read_watermark(n, last_read_at) for n in notifications]
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -39,9 +75,9 @@ async def mark_notification_read(
 ):
     """FR-091: Mark as Read"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("notifications").update({
+        result = await db.table("notifications").update({
             "is_read": True,
             "read_at": "now()"
         }).eq("id", str(notification_id)).eq(
@@ -51,6 +87,8 @@ async def mark_notification_read(
         if not result.data:
             raise HTTPException(status_code=404, detail="Notification not found")
 
+        await notification_service.publish_unread_count(current_user["id"])
+
         return result.data[0]
 
     except HTTPException:
@@ -62,12 +100,16 @@ async def mark_notification_read(
 async def mark_all_read(current_user: dict = Depends(get_current_user)):
     """FR-091: Mark as Read - Mark all"""
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        supabase.table("notifications").update({
-            "is_read": True,
-            "read_at": "now()"
-        }).eq("user_id", current_user["id"]).eq("is_read", False).execute()
+        # Move the read watermark; older notifications count as read
+        await db.table("notification_read_state").upsert({
+            "user_id": current_user["id"],
+            "last_read_at": "now()",
+            "unread_count": 0
+        }).execute()
+
+        await notification_service.publish_unread_count(current_user["id"])
 
         return {"message": "All notifications marked as read"}
 
@@ -78,13 +120,46 @@ async def mark_all_read(current_user: dict = Depends(get_current_user)):
 async def get_unread_count(current_user: dict = Depends(get_current_user)):
     """Get unread notification count"""
     try:
-        supabase = get_supabase()
-
-        count = supabase.table("notifications").select(
-            "id", count="exact"
-        ).eq("user_id", current_user["id"]).eq("is_read", False).execute().count
+        count = await notification_service.get_unread_count(current_user["id"])
 
         return {"unread_count": count}
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: dict = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of new notifications and unread-count changes.
+    Replaces polling of the list and unread-count endpoints.
+    FR-090: In-App Notification
+    """
+    user_id = current_user["id"]
+
+    async def events():
+        queue = notification_hub.subscribe(user_id)
+        try:
+            # Current count first, so a (re)connecting client is in sync
+            count = await notification_service.get_unread_count(user_id)
+            yield format_sse("unread_count", {"unread_count": count})
+
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(message["event"], message["data"])
+        finally:
+            notification_hub.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from src.models.schemas import *
-from src.database.supabase import get_supabase
-from src.api.dependencies import get_current_user, verify_team_membership, verify_team_admin
+from src.database.repository import get_db
+from src.api.dependencies import get_current_user, verify_team_membership, verify_team_admin, verify_project_access
 from typing import List
 from uuid import UUID
+import asyncio
 
 router = APIRouter()
 
@@ -19,12 +20,12 @@ async def create_project(
     """
     try:
         await verify_team_membership(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
         # Check project limit (max 15 per team)
-        count = supabase.table("projects").select("id", count="exact").eq(
+        count = (await db.table("projects").select("id", count="exact").eq(
             "team_id", str(team_id)
-        ).is_("deleted_at", "null").execute().count
+        ).is_("deleted_at", "null").execute()).count
 
         if count >= 15:
             raise HTTPException(
@@ -33,7 +34,7 @@ async def create_project(
             )
 
         # Create project
-        result = supabase.table("projects").insert({
+        result = await db.table("projects").insert({
             "team_id": str(team_id),
             "name": project_data.name,
             "description": project_data.description,
@@ -41,7 +42,7 @@ async def create_project(
         }).execute()
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": str(team_id),
             "user_id": current_user["id"],
             "action_type": "project_created",
@@ -50,7 +51,7 @@ async def create_project(
             "description": f"{current_user['name']} created project '{project_data.name}'"
         }).execute()
 
-        return {**result.data[0], "issue_count": 0, "is_favorited": False}
+        return {**result.data[0], "is_favorited": False}
 
     except HTTPException:
         raise
@@ -71,32 +72,29 @@ async def get_team_projects(
     """
     try:
         await verify_team_membership(team_id, current_user)
-        supabase = get_supabase()
-
-        projects = supabase.table("projects").select("*").eq(
-            "team_id", str(team_id)
-        ).is_("deleted_at", "null").order("created_at", desc=True).execute()
-
-        result = []
-        for project in projects.data:
-            # Get issue count
-            issue_count = supabase.table("issues").select("id", count="exact").eq(
-                "project_id", project["id"]
-            ).is_("deleted_at", "null").execute().count
+        db = get_db()
+
+        # Projects with their issue counts, and the user's favorites in the team
+        projects, favorites = await asyncio.gather(
+            db.table("projects").select("*").eq(
+                "team_id", str(team_id)
+            ).is_("deleted_at", "null").order(
+                "created_at", desc=True
+            ).execute(),
+            db.table("project_favorites").select("project_id, projects!inner(team_id)").eq(
+                "user_id", current_user["id"]
+            ).eq("projects.team_id", str(team_id)).execute()
+        )
 
-            # Check if favorited
-            favorite = supabase.table("project_favorites").select("id").eq(
-                "project_id", project["id"]
-            ).eq("user_id", current_user["id"]).execute()
+        favorite_ids = {favorite["project_id"] for favorite in favorites.data}
 
-            result.append({
-                **project,
-                "issue_count": issue_count,
-                "is_favorited": len(favorite.data) > 0
-            })
+        result = [
+            {**project, "is_favorited": project["id"] in favorite_ids}
+            for project in projects.data
+        ]
 
-        # Sort: favorites first, then by created_at
-        result.sort(key=lambda x: (not x["is_favorited"], x["created_at"]), reverse=True)
+        # Sort: favorites first, then by created_at (already newest first)
+        result.sort(key=lambda x: not x["is_favorited"])
 
         return result
 
@@ -118,30 +116,17 @@ async def get_project(
     FR-022: Project Detail Page
     """
     try:
-        supabase = get_supabase()
-
-        project = supabase.table("projects").select("*").eq(
-            "id", str(project_id)
-        ).is_("deleted_at", "null").single().execute()
-
-        if not project.data:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        await verify_team_membership(UUID(project.data["team_id"]), current_user)
-
-        # Get issue count
-        issue_count = supabase.table("issues").select("id", count="exact").eq(
-            "project_id", str(project_id)
-        ).is_("deleted_at", "null").execute().count
+        project = await verify_project_access(project_id, current_user)
+        project.pop("membership")
+        db = get_db()
 
         # Check if favorited
-        favorite = supabase.table("project_favorites").select("id").eq(
+        favorite = await db.table("project_favorites").select("id").eq(
             "project_id", str(project_id)
         ).eq("user_id", current_user["id"]).execute()
 
         return {
-            **project.data,
-            "issue_count": issue_count,
+            **project,
             "is_favorited": len(favorite.data) > 0
         }
 
@@ -164,26 +149,21 @@ async def update_project(
     FR-023: Update Project
     """
     try:
-        supabase = get_supabase()
-
         # Get project and check permissions
-        project = supabase.table("projects").select("*, teams!inner(id)").eq(
-            "id", str(project_id)
-        ).is_("deleted_at", "null").single().execute()
-
-        team_id = UUID(project.data["team_id"])
-        membership = await verify_team_membership(team_id, current_user)
+        project = await verify_project_access(project_id, current_user)
+        membership = project["membership"]
+        db = get_db()
 
         # Only OWNER, ADMIN, or project owner can update
-        if membership["role"] not in ["OWNER", "ADMIN"] and project.data["owner_id"] != current_user["id"]:
+        if membership["role"] not in ["OWNER", "ADMIN"] and project["owner_id"] != current_user["id"]:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
 
         update_data = project_data.dict(exclude_unset=True)
-        result = supabase.table("projects").update(update_data).eq(
+        result = await db.table("projects").update(update_data).eq(
             "id", str(project_id)
         ).execute()
 
-        return {**result.data[0], "issue_count": 0, "is_favorited": False}
+        return {**result.data[0], "is_favorited": False}
 
     except HTTPException:
         raise
@@ -200,19 +180,14 @@ async def delete_project(
     FR-024: Delete Project
     """
     try:
-        supabase = get_supabase()
-
-        project = supabase.table("projects").select("*, teams!inner(id)").eq(
-            "id", str(project_id)
-        ).is_("deleted_at", "null").single().execute()
-
-        team_id = UUID(project.data["team_id"])
-        membership = await verify_team_membership(team_id, current_user)
+        project = await verify_project_access(project_id, current_user)
+        membership = project["membership"]
+        db = get_db()
 
-        if membership["role"] not in ["OWNER", "ADMIN"] and project.data["owner_id"] != current_user["id"]:
+        if membership["role"] not in ["OWNER", "ADMIN"] and project["owner_id"] != current_user["id"]:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-        supabase.table("projects").update({"deleted_at": "now()"}).eq(
+        await db.table("projects").update({"deleted_at": "now()"}).eq(
             "id", str(project_id)
         ).execute()
 
@@ -233,22 +208,22 @@ async def toggle_favorite(
     FR-027: Favorite Project
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         # Check if already favorited
-        existing = supabase.table("project_favorites").select("id").eq(
+        existing = await db.table("project_favorites").select("id").eq(
             "project_id", str(project_id)
         ).eq("user_id", current_user["id"]).execute()
 
         if existing.data:
             # Remove favorite
-            supabase.table("project_favorites").delete().eq(
+            await db.table("project_favorites").delete().eq(
                 "id", existing.data[0]["id"]
             ).execute()
             return {"message": "Removed from favorites", "is_favorited": False}
         else:
             # Add favorite
-            supabase.table("project_favorites").insert({
+            await db.table("project_favorites").insert({
                 "project_id": str(project_id),
                 "user_id": current_user["id"]
             }).execute()
@@ -270,17 +245,17 @@ async def create_label(
     FR-038: Issue Labels/Tags
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         # Check label limit (max 20 per project)
-        count = supabase.table("labels").select("id", count="exact").eq(
+        count = (await db.table("labels").select("id", count="exact").eq(
             "project_id", str(project_id)
-        ).execute().count
+        ).execute()).count
 
         if count >= 20:
             raise HTTPException(status_code=400, detail="Maximum 20 labels per project")
 
-        result = supabase.table("labels").insert({
+        result = await db.table("labels").insert({
             "project_id": str(project_id),
             "name": label_data.name,
             "color": label_data.color
@@ -302,9 +277,9 @@ async def get_project_labels(
     Get all labels for a project.
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("labels").select("*").eq(
+        result = await db.table("labels").select("*").eq(
             "project_id", str(project_id)
         ).execute()
 
@@ -326,17 +301,17 @@ async def create_custom_status(
     FR-053: Custom Columns (Custom Status)
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         # Check limit (max 5 custom statuses)
-        count = supabase.table("custom_statuses").select("id", count="exact").eq(
+        count = (await db.table("custom_statuses").select("id", count="exact").eq(
             "project_id", str(project_id)
-        ).execute().count
+        ).execute()).count
 
         if count >= 5:
             raise HTTPException(status_code=400, detail="Maximum 5 custom statuses allowed")
 
-        result = supabase.table("custom_statuses").insert({
+        result = await db.table("custom_statuses").insert({
             "project_id": str(project_id),
             "name": status_data.name,
             "color": status_data.color,
@@ -360,9 +335,9 @@ async def get_custom_statuses(
     Get all custom statuses for a project.
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("custom_statuses").select("*").eq(
+        result = await db.table("custom_statuses").select("*").eq(
             "project_id", str(project_id)
         ).order("position").execute()
 
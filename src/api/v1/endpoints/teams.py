@@ -1,15 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from src.models.schemas import *
-from src.database.supabase import get_supabase
-from src.api.dependencies import get_current_user, verify_team_membership, verify_team_admin, verify_team_owner
+from src.database.repository import get_db
+from src.api.pagination import paginate
+from src.api.dependencies import (
+    get_current_user, verify_team_membership, verify_team_admin, verify_team_owner,
+    invalidate_team_membership
+)
 from src.services.email_service import EmailService
-from typing import List
+from src.services.notification_service import NotificationService
+from typing import List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 import secrets
 
 router = APIRouter()
 email_service = EmailService()
+notification_service = NotificationService()
 
 # Team CRUD Operations
 
@@ -23,10 +29,10 @@ async def create_team(
     FR-010: Create Team
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         # Create team
-        team_result = supabase.table("teams").insert({
+        team_result = await db.table("teams").insert({
             "name": team_data.name,
             "owner_id": current_user["id"]
         }).execute()
@@ -37,14 +43,15 @@ async def create_team(
         team = team_result.data[0]
 
         # Add creator as OWNER in team_members
-        supabase.table("team_members").insert({
+        await db.table("team_members").insert({
             "team_id": team["id"],
             "user_id": current_user["id"],
             "role": "OWNER"
         }).execute()
+        await invalidate_team_membership(current_user["id"], team["id"])
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": team["id"],
             "user_id": current_user["id"],
             "action_type": "team_created",
@@ -68,28 +75,14 @@ async def get_my_teams(current_user: dict = Depends(get_current_user)):
     FR-010, FR-011: View Teams
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        # Get teams with member info
-        result = supabase.table("team_members").select(
-            "role, teams!inner(id, name, owner_id, created_at, updated_at)"
+        # Get teams with member info and member counts in one query
+        result = await db.table("team_members").select(
+            "role, teams!inner(id, name, owner_id, created_at, updated_at, member_count)"
         ).eq("user_id", current_user["id"]).execute()
 
-        teams = []
-        for item in result.data:
-            team = item["teams"]
-            # Get member count
-            member_count = supabase.table("team_members").select(
-                "id", count="exact"
-            ).eq("team_id", team["id"]).execute().count
-
-            teams.append({
-                **team,
-                "member_count": member_count,
-                "my_role": item["role"]
-            })
-
-        return teams
+        return [{**item["teams"], "my_role": item["role"]} for item in result.data]
 
     except Exception as e:
         raise HTTPException(
@@ -107,17 +100,13 @@ async def get_team(
     """
     try:
         membership = await verify_team_membership(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        team = supabase.table("teams").select("*").eq(
+        team = await db.table("teams").select("*").eq(
             "id", str(team_id)
         ).is_("deleted_at", "null").single().execute()
 
-        member_count = supabase.table("team_members").select(
-            "id", count="exact"
-        ).eq("team_id", str(team_id)).execute().count
-
-        return {**team.data, "member_count": member_count, "my_role": membership["role"]}
+        return {**team.data, "my_role": membership["role"]}
 
     except Exception as e:
         raise HTTPException(
@@ -137,14 +126,14 @@ async def update_team(
     """
     try:
         await verify_team_admin(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("teams").update({
+        result = await db.table("teams").update({
             "name": team_data.name
         }).eq("id", str(team_id)).execute()
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": str(team_id),
             "user_id": current_user["id"],
             "action_type": "team_updated",
@@ -174,10 +163,10 @@ async def delete_team(
     """
     try:
         await verify_team_owner(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
         # Soft delete team and all related entities
-        supabase.table("teams").update({
+        await db.table("teams").update({
             "deleted_at": "now()"
         }).eq("id", str(team_id)).execute()
 
@@ -204,9 +193,9 @@ async def get_team_members(
     """
     try:
         await verify_team_membership(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("team_members").select(
+        result = await db.table("team_members").select(
             "*, user_profiles!inner(id, name, email, profile_image)"
         ).eq("team_id", str(team_id)).execute()
 
@@ -243,10 +232,10 @@ async def invite_team_member(
     """
     try:
         await verify_team_admin(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
         # Check if user is already a member
-        existing_member = supabase.table("team_members").select("id").eq(
+        existing_member = await db.table("team_members").select("id").eq(
             "team_id", str(team_id)
         ).eq("user_id", invite_data.invitee_email).execute()
 
@@ -261,7 +250,7 @@ async def invite_team_member(
         expires_at = datetime.utcnow() + timedelta(days=7)
 
         # Create invite
-        invite = supabase.table("team_invites").insert({
+        invite = await db.table("team_invites").insert({
             "team_id": str(team_id),
             "inviter_id": current_user["id"],
             "invitee_email": invite_data.invitee_email,
@@ -272,7 +261,7 @@ async def invite_team_member(
         }).execute()
 
         # Get team info
-        team = supabase.table("teams").select("name").eq(
+        team = await db.table("teams").select("name").eq(
             "id", str(team_id)
         ).single().execute()
 
@@ -286,7 +275,7 @@ async def invite_team_member(
         )
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": str(team_id),
             "user_id": current_user["id"],
             "action_type": "member_invited",
@@ -315,10 +304,10 @@ async def accept_team_invite(
     FR-013: Invite Member - Accept
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         # Get invite
-        invite = supabase.table("team_invites").select("*").eq(
+        invite = await db.table("team_invites").select("*").eq(
             "token", token
         ).eq("status", "pending").single().execute()
 
@@ -336,19 +325,20 @@ async def accept_team_invite(
             )
 
         # Add user to team
-        supabase.table("team_members").insert({
+        await db.table("team_members").insert({
             "team_id": invite.data["team_id"],
             "user_id": current_user["id"],
             "role": invite.data["role"]
         }).execute()
+        await invalidate_team_membership(current_user["id"], invite.data["team_id"])
 
         # Update invite status
-        supabase.table("team_invites").update({
+        await db.table("team_invites").update({
             "status": "accepted"
         }).eq("id", invite.data["id"]).execute()
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": invite.data["team_id"],
             "user_id": current_user["id"],
             "action_type": "member_joined",
@@ -379,7 +369,7 @@ async def change_member_role(
     """
     try:
         await verify_team_owner(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
         # Cannot change own role
         if str(user_id) == current_user["id"]:
@@ -388,21 +378,22 @@ async def change_member_role(
                 detail="Cannot change your own role"
             )
 
-        result = supabase.table("team_members").update({
+        result = await db.table("team_members").update({
             "role": role_data.role.value
         }).eq("team_id", str(team_id)).eq("user_id", str(user_id)).execute()
+        await invalidate_team_membership(str(user_id), str(team_id))
 
         # Send notification
-        supabase.table("notifications").insert({
-            "user_id": str(user_id),
-            "type": "role_change",
-            "title": "Your role has been updated",
-            "message": f"Your role in the team has been changed to {role_data.role.value}",
-            "link": f"/teams/{team_id}"
-        }).execute()
+        await notification_service.create_notification(
+            user_id=str(user_id),
+            type="role_change",
+            title="Your role has been updated",
+            message=f"Your role in the team has been changed to {role_data.role.value}",
+            link=f"/teams/{team_id}"
+        )
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": str(team_id),
             "user_id": current_user["id"],
             "action_type": "role_changed",
@@ -432,10 +423,10 @@ async def kick_team_member(
     """
     try:
         membership = await verify_team_admin(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
         # Get target member's role
-        target = supabase.table("team_members").select("role").eq(
+        target = await db.table("team_members").select("role").eq(
             "team_id", str(team_id)
         ).eq("user_id", str(user_id)).single().execute()
 
@@ -454,12 +445,13 @@ async def kick_team_member(
             )
 
         # Remove from team
-        supabase.table("team_members").delete().eq(
+        await db.table("team_members").delete().eq(
             "team_id", str(team_id)
         ).eq("user_id", str(user_id)).execute()
+        await invalidate_team_membership(str(user_id), str(team_id))
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": str(team_id),
             "user_id": current_user["id"],
             "action_type": "member_kicked",
@@ -495,15 +487,16 @@ async def leave_team(
                 detail="Owners cannot leave the team. Delete the team or transfer ownership first."
             )
 
-        supabase = get_supabase()
+        db = get_db()
 
         # Remove from team
-        supabase.table("team_members").delete().eq(
+        await db.table("team_members").delete().eq(
             "team_id", str(team_id)
         ).eq("user_id", current_user["id"]).execute()
+        await invalidate_team_membership(current_user["id"], str(team_id))
 
         # Log activity
-        supabase.table("activity_logs").insert({
+        await db.table("activity_logs").insert({
             "team_id": str(team_id),
             "user_id": current_user["id"],
             "action_type": "member_left",
@@ -526,8 +519,9 @@ async def leave_team(
 @router.get("/{team_id}/activity", response_model=List[ActivityLogResponse])
 async def get_team_activity(
     team_id: UUID,
+    response: Response,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -536,16 +530,14 @@ async def get_team_activity(
     """
     try:
         await verify_team_membership(team_id, current_user)
-        supabase = get_supabase()
+        db = get_db()
 
-        result = supabase.table("activity_logs").select(
+        query = db.table("activity_logs").select(
             "*, user_profiles!inner(id, name, email, profile_image)"
-        ).eq("team_id", str(team_id)).order(
-            "created_at", desc=True
-        ).range(offset, offset + limit - 1).execute()
+        ).eq("team_id", str(team_id))
 
         activities = []
-        for item in result.data:
+        for item in await paginate(query, response, limit, cursor):
             activity = {
                 "id": item["id"],
                 "team_id": item["team_id"],
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from src.models.schemas import UserProfileUpdate, UserProfileResponse
-from src.database.supabase import get_supabase, get_supabase_admin
-from src.api.dependencies import get_current_user
+from src.database.repository import get_db, get_admin_db
+from src.database.supabase import get_supabase_admin
+from src.api.dependencies import get_current_user, profile_cache
 from typing import List
 from uuid import UUID
 
@@ -25,14 +27,14 @@ async def update_my_profile(
     FR-005: Profile Management - Edit
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
         update_data = profile_data.dict(exclude_unset=True)
 
         if not update_data:
             return UserProfileResponse(**current_user)
 
-        result = supabase.table("user_profiles").update(
+        result = await db.table("user_profiles").update(
             update_data
         ).eq("id", current_user["id"]).execute()
 
@@ -42,6 +44,8 @@ async def update_my_profile(
                 detail="Failed to update profile"
             )
 
+        profile_cache.set(current_user["id"], result.data[0])
+
         return UserProfileResponse(**result.data[0])
 
     except HTTPException:
@@ -59,10 +63,10 @@ async def delete_my_account(current_user: dict = Depends(get_current_user)):
     FR-007: Account Deletion
     """
     try:
-        supabase = get_supabase_admin()
+        db = get_admin_db()
 
         # Check if user owns any teams
-        owned_teams = supabase.table("teams").select("id").eq(
+        owned_teams = await db.table("teams").select("id").eq(
             "owner_id", current_user["id"]
         ).is_("deleted_at", "null").execute()
 
@@ -73,12 +77,14 @@ async def delete_my_account(current_user: dict = Depends(get_current_user)):
             )
 
         # Soft delete user profile
-        supabase.table("user_profiles").update({
+        await db.table("user_profiles").update({
             "deleted_at": "now()"
         }).eq("id", current_user["id"]).execute()
+        profile_cache.delete(current_user["id"])
 
         # Delete auth user
-        supabase.auth.admin.delete_user(current_user["id"])
+        supabase = get_supabase_admin()
+        await run_in_threadpool(supabase.auth.admin.delete_user, current_user["id"])
 
         return {"message": "Account successfully deleted"}
 
@@ -99,9 +105,9 @@ async def get_user_profile(
     Get any user's profile (public info only).
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        user = supabase.table("user_profiles").select("*").eq(
+        user = await db.table("user_profiles").select("*").eq(
             "id", str(user_id)
         ).is_("deleted_at", "null").single().execute()
 
@@ -130,15 +136,15 @@ async def search_users(
     Search users by name or email.
     """
     try:
-        supabase = get_supabase()
+        db = get_db()
 
-        query = supabase.table("user_profiles").select("*").is_("deleted_at", "null")
+        query = db.table("user_profiles").select("*").is_("deleted_at", "null")
 
         if q:
             # Simple search - in production, use full-text search
             query = query.or_(f"name.ilike.%{q}%,email.ilike.%{q}%")
 
-        result = query.limit(10).execute()
+        result = await query.limit(10).execute()
 
         return [UserProfileResponse(**user) for user in result.data]
 
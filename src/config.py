@@ -11,17 +11,79 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: str
 
+    # Auth (local JWT verification)
+    SUPABASE_JWT_SECRET: str = ""
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    JWKS_REFRESH_INTERVAL: int = 600  # seconds
+    PROFILE_CACHE_TTL: int = 60  # seconds
+    PROFILE_CACHE_SIZE: int = 10000
+
+    # Database HTTP pool (async PostgREST client)
+    DB_HTTP2: bool = True
+    DB_POOL_MAX_CONNECTIONS: int = 100
+    DB_POOL_MAX_KEEPALIVE: int = 20
+    DB_POOL_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    DB_CONNECT_TIMEOUT: float = 5.0  # seconds
+    DB_READ_TIMEOUT: float = 10.0  # seconds
+    DB_POOL_TIMEOUT: float = 5.0  # seconds to wait for a free connection
+    DB_POOL_WARM_CONNECTIONS: int = 2  # opened at startup
+
     # Email (Resend)
     RESEND_API_KEY: str
     FROM_EMAIL: str
+    EMAIL_TRANSPORT: str = "resend"  # "resend", "smtp" or "file"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    EMAIL_FILE_SINK_PATH: str = "email_outbox.jsonl"
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_MAX_PER_SECOND: float = 10.0
+    EMAIL_MAX_ATTEMPTS: int = 6
+    EMAIL_RETRY_BASE_DELAY: int = 30  # seconds, doubled per attempt
+    EMAIL_RETRY_MAX_DELAY: int = 3600
+    EMAIL_CLAIM_LEASE: int = 300  # seconds before a claimed email can be reclaimed
+    EMAIL_POLL_INTERVAL: float = 5.0
 
     # AI
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    ANTHROPIC_MODEL: str = "claude-3-haiku-20240307"
+    AI_RATE_LIMIT_PER_MINUTE: int = 10
+    AI_RATE_LIMIT_PER_DAY: int = 100
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_READ_TIMEOUT: float = 30.0
+    LLM_TOTAL_TIMEOUT: float = 45.0  # whole call, including waiting for a slot
+    LLM_MAX_CONNECTIONS: int = 50
+    LLM_MAX_CONCURRENCY: int = 8  # in-flight calls per provider
+    LLM_MAX_RETRIES: int = 1
+    AI_CACHE_SIZE: int = 2048  # results kept in each worker's LRU tier
+    AI_CACHE_TTL: int = 86400  # seconds in the LRU tier; the table tier keeps them
+    DUPLICATE_INDEX_PROJECTS: int = 512  # project indexes kept per worker
+    DUPLICATE_INDEX_TTL: int = 300  # seconds before a project index is rebuilt
+    EMBEDDING_PROVIDER: str = "openai"  # "openai" or "hashing" (local, offline)
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_DIMENSIONS: int = 256  # hashing embedder only
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_QUEUE_SIZE: int = 1000  # issues waiting to be embedded
+    EMBEDDING_CACHE_SIZE: int = 4096  # vectors kept per worker, by content hash
+    EMBEDDING_SIMILARITY_THRESHOLD: float = 0.6  # minimum cosine for a semantic match
+    COMMENT_SUMMARY_CHUNK_SIZE: int = 20  # comments per cached chunk summary
+    AI_LABEL_BATCH_TOKEN_BUDGET: int = 6000  # prompt tokens per batched label call
+    AI_LABEL_BATCH_MAX_ISSUES: int = 40  # issues per batched label call
+    AI_LABEL_DESCRIPTION_CHARS: int = 500  # description prefix sent per issue
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
 
+    # Caching
+    CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    MEMBERSHIP_CACHE_TTL: int = 60  # seconds
+    MEMBERSHIP_CACHE_SIZE: int = 10000
+
+    # Notification push
+    NOTIFICATION_STREAM_KEEPALIVE: int = 15  # seconds between SSE keepalive comments
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100  # pending events per connection
+
     # App
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Jira Lite API"
@@ -0,0 +1,73 @@
+from httpx import AsyncHTTPTransport, Limits, Request, Response
+from src.config import settings
+import time
+
+class InstrumentedTransport(AsyncHTTPTransport):
+    """
+    Pooled HTTP transport shared by every async database client.
+    Records pool statistics: connections in use and idle, requests in
+    flight, and how long requests waited for a connection. Wait time is
+    measured up to the moment request headers are sent, excluding time
+    spent opening a new connection.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.total_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def handle_async_request(self, request: Request) -> Response:
+        started = time.perf_counter()
+        connecting = {"since": None, "elapsed": 0.0, "waited": None}
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict):
+            now = time.perf_counter()
+            if event in ("connection.connect_tcp.started", "connection.start_tls.started"):
+                connecting["since"] = now
+            elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                if connecting["since"] is not None:
+                    connecting["elapsed"] += now - connecting["since"]
+                    connecting["since"] = None
+            elif event.endswith("send_request_headers.started") and connecting["waited"] is None:
+                connecting["waited"] = max(now - started - connecting["elapsed"], 0.0)
+
+            if parent_trace is not None:
+                await parent_trace(event, info)
+
+        request.extensions["trace"] = trace
+        self.in_flight += 1
+        self.total_requests += 1
+
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+            if connecting["waited"] is not None:
+                self.total_wait += connecting["waited"]
+                self.max_wait = max(self.max_wait, connecting["waited"])
+
+    def stats(self) -> dict:
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "in_flight_requests": self.in_flight,
+            "total_requests": self.total_requests,
+            "avg_wait_ms": round(self.total_wait / self.total_requests * 1000, 3) if self.total_requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3)
+        }
+
+def create_transport() -> InstrumentedTransport:
+    return InstrumentedTransport(
+        http2=settings.DB_HTTP2,
+        limits=Limits(
+            max_connections=settings.DB_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DB_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.DB_POOL_KEEPALIVE_EXPIRY
+        )
+    )
@@ -0,0 +1,31 @@
+from src.config import settings
+import redis.asyncio as aioredis
+
+redis_client: aioredis.Redis = None
+
+async def init_redis() -> aioredis.Redis:
+    """
+    Connect to Redis. Leaves the client unset when Redis is not reachable,
+    so callers fall back to their in-process implementations.
+    """
+    global redis_client
+    client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+
+    try:
+        await client.ping()
+    except Exception as e:
+        print(f"Redis unavailable, using in-process fallbacks: {str(e)}")
+        await client.aclose()
+        return None
+
+    redis_client = client
+    return redis_client
+
+def get_redis() -> aioredis.Redis:
+    return redis_client
+
+async def close_redis():
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+    redis_client = None
@@ -0,0 +1,95 @@
+from httpx import AsyncClient, AsyncHTTPTransport, Timeout
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+from src.config import settings
+from src.database.pool import InstrumentedTransport, create_transport
+from typing import Dict, Optional, Union
+import asyncio
+
+transport: Optional[InstrumentedTransport] = None
+repository: "AsyncRepository" = None
+admin_repository: "AsyncRepository" = None
+
+class AsyncRepository(AsyncPostgrestClient):
+    """
+    Non-blocking PostgREST client for use inside async endpoints.
+    Sessions are built on a shared pooled transport (keep-alive, HTTP/2),
+    so concurrent requests on one worker overlap their database calls.
+    """
+    def __init__(self, pool: AsyncHTTPTransport, key: str):
+        self.pool = pool
+        super().__init__(
+            f"{settings.SUPABASE_URL}/rest/v1",
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apikey": key,
+                "Authorization": f"Bearer {key}"
+            },
+            timeout=Timeout(
+                settings.DB_READ_TIMEOUT,
+                connect=settings.DB_CONNECT_TIMEOUT,
+                pool=settings.DB_POOL_TIMEOUT
+            )
+        )
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, Timeout],
+    ) -> AsyncClient:
+        return AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=self.pool
+        )
+
+    async def aclose(self) -> None:
+        # The transport is shared; it is closed once by close_repository()
+        pass
+
+def init_repository() -> AsyncRepository:
+    global transport, repository, admin_repository
+    transport = create_transport()
+    repository = AsyncRepository(transport, settings.SUPABASE_KEY)
+    admin_repository = AsyncRepository(transport, settings.SUPABASE_SERVICE_KEY)
+    return repository
+
+def get_db() -> AsyncRepository:
+    if repository is None:
+        return init_repository()
+    return repository
+
+def get_admin_db() -> AsyncRepository:
+    """Get repository with service role key for admin operations"""
+    if admin_repository is None:
+        init_repository()
+    return admin_repository
+
+async def warm_repository():
+    """
+    Open pool connections ahead of the first request.
+    """
+    db = get_db()
+
+    async def ping():
+        try:
+            await db.session.head("/")
+        except Exception as e:
+            print(f"Connection pool warm-up failed: {str(e)}")
+
+    await asyncio.gather(*(ping() for _ in range(settings.DB_POOL_WARM_CONNECTIONS)))
+
+def get_pool_stats() -> dict:
+    if transport is None:
+        return {}
+    return transport.stats()
+
+async def close_repository():
+    global transport, repository, admin_repository
+    if transport is not None:
+        await transport.aclose()
+    transport = None
+    repository = None
+    admin_repository = None
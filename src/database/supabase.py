@@ -2,10 +2,12 @@ from supabase import create_client, Client
 from src.config import settings
 
 supabase: Client = None
+supabase_admin: Client = None
 
 def init_supabase():
-    global supabase
+    global supabase, supabase_admin
     supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    supabase_admin = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
     return supabase
 
 def get_supabase() -> Client:
@@ -15,4 +17,15 @@ def get_supabase() -> Client:
 
 def get_supabase_admin() -> Client:
     """Get Supabase client with service role key for admin operations"""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+    if supabase_admin is None:
+        init_supabase()
+    return supabase_admin
+
+def close_supabase():
+    global supabase, supabase_admin
+    for client in (supabase, supabase_admin):
+        if client is not None:
+            client.auth.close()
+            client.postgrest.aclose()
+    supabase = None
+    supabase_admin = None
@@ -6,7 +6,16 @@ import time
 
 from src.config import settings
 from src.api.v1.router import api_router
-from src.database.supabase import init_supabase
+from src.api.pagination import NEXT_CURSOR_HEADER
+from src.database.supabase import init_supabase, close_supabase
+from src.database.repository import init_repository, warm_repository, close_repository, get_pool_stats
+from src.database.redis import init_redis, close_redis
+from src.services.jwt_verifier import jwt_verifier
+from src.services.notification_hub import notification_hub
+from src.services.email_outbox import email_outbox
+from src.services.semantic_index import semantic_index
+from src.services.single_flight import get_single_flight_stats
+from src.services.llm_client import init_llm_clients, close_llm_clients
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -14,9 +23,27 @@ async def lifespan(app: FastAPI):
     print(">> Starting up Jira Lite API...")
     init_supabase()
     print(">> Supabase initialized")
+    init_repository()
+    await warm_repository()
+    print(">> Async repository initialized")
+    if await init_redis():
+        print(">> Redis connected")
+    init_llm_clients()
+    jwt_verifier.start()
+    notification_hub.start()
+    email_outbox.start()
+    semantic_index.start()
     yield
     # Shutdown
     print(">> Shutting down...")
+    await jwt_verifier.stop()
+    await notification_hub.stop()
+    await email_outbox.stop()
+    await semantic_index.stop()
+    await close_llm_clients()
+    await close_repository()
+    close_supabase()
+    await close_redis()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -31,6 +58,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Request timing middleware
@@ -65,6 +93,13 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "db_pool": get_pool_stats(),
+        "single_flight": get_single_flight_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -322,6 +322,18 @@ class AILabelRecommendationRequest(BaseModel):
 class AILabelRecommendationResponse(BaseModel):
     recommended_labels: List[UUID]
 
+class AIBatchLabelRequest(BaseModel):
+    issue_ids: Optional[List[UUID]] = Field(None, max_length=200)  # None: all unlabelled issues
+    apply: bool = False
+
+class AIBatchLabelResult(BaseModel):
+    issue_id: UUID
+    recommended_labels: List[UUID]
+
+class AIBatchLabelResponse(BaseModel):
+    results: List[AIBatchLabelResult]
+    applied: int = 0
+
 # Dashboard Schemas
 class ProjectDashboardResponse(BaseModel):
     issue_counts_by_status: dict
@@ -0,0 +1,61 @@
+from src.config import settings
+from src.database.repository import get_admin_db
+from src.services.cache import TTLCache
+from typing import Optional
+import hashlib
+import json
+
+class AIResultCache:
+    """
+    Two-tier cache for AI results keyed by a hash of the request itself:
+    an in-process LRU in front of the ai_result_cache table. Identical
+    requests hit the cache; any change to the inputs or model is a miss.
+    """
+    def __init__(self):
+        self.memory = TTLCache(
+            maxsize=settings.AI_CACHE_SIZE,
+            ttl=settings.AI_CACHE_TTL
+        )
+
+    @staticmethod
+    def make_key(operation: str, model: str, *inputs: str) -> str:
+        payload = json.dumps([operation, model, *inputs], ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+
+        try:
+            db = get_admin_db()
+            row = await db.table("ai_result_cache").select("result").eq(
+                "cache_key", key
+            ).execute()
+        except Exception as e:
+            print(f"AI cache read failed: {str(e)}")
+            return None
+
+        if not row.data:
+            return None
+
+        result = row.data[0]["result"]
+        self.memory.set(key, result)
+        return result
+
+    async def set(self, key: str, operation: str, model: str, result: str):
+        self.memory.set(key, result)
+
+        try:
+            db = get_admin_db()
+            await db.table("ai_result_cache").upsert({
+                "cache_key": key,
+                "operation": operation,
+                "model": model,
+                "result": result
+            }).execute()
+        except Exception as e:
+            # The in-process tier still serves this worker
+            print(f"AI cache write failed: {str(e)}")
+
+ai_cache = AIResultCache()
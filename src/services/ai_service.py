@@ -1,148 +1,181 @@
 from src.config import settings
-from src.database.supabase import get_supabase
-from datetime import datetime, timedelta
+from src.services.rate_limiter import RateLimiter
+from src.services.llm_client import get_openai_client, get_anthropic_client, get_provider_limit
+from src.services.ai_cache import AIResultCache
 from fastapi import HTTPException
-import openai
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
+import asyncio
 import json
+import re
+
+# Output allowance per issue in a batched label prompt
+LABEL_TOKENS_PER_ISSUE = 30
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
 
 class AIService:
     def __init__(self):
         self.use_openai = bool(settings.OPENAI_API_KEY)
         self.use_anthropic = bool(settings.ANTHROPIC_API_KEY)
+        self.rate_limiter = RateLimiter("ai_rate", [
+            ("minute", 60, settings.AI_RATE_LIMIT_PER_MINUTE),
+            ("day", 86400, settings.AI_RATE_LIMIT_PER_DAY)
+        ])
 
+    @property
+    def model(self) -> Optional[str]:
+        """
+        Model that answers requests, or None when no provider is configured
+        """
         if self.use_openai:
-            openai.api_key = settings.OPENAI_API_KEY
-        elif self.use_anthropic:
-            try:
-                import anthropic
-                self.anthropic_client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            except ImportError:
-                print("Warning: anthropic package not installed")
+            return settings.OPENAI_MODEL
+        if self.use_anthropic:
+            return settings.ANTHROPIC_MODEL
+        return None
+
+    def summary_cache_key(self, description: str) -> str:
+        return AIResultCache.make_key("summary", self.model, *self._summary_prompt(description))
+
+    def suggestion_cache_key(self, title: str, description: str) -> str:
+        return AIResultCache.make_key("suggestion", self.model, *self._suggestion_prompt(title, description))
 
     async def check_rate_limit(self, user_id: str):
         """
         FR-042: AI Rate Limiting
-        Check if user has exceeded rate limit (10 per minute or 100 per day)
+        Check and count one request against the per-minute and per-day limits
+        in a single atomic step.
         """
-        supabase = get_supabase()
-
-        # Check per-minute limit
-        minute_start = datetime.utcnow().replace(second=0, microsecond=0)
-        minute_record = supabase.table("ai_rate_limits").select("*").eq(
-            "user_id", user_id
-        ).eq("window_type", "minute").eq(
-            "window_start", minute_start.isoformat()
-        ).execute()
+        exceeded = await self.rate_limiter.hit(user_id)
 
-        if minute_record.data and minute_record.data[0]["request_count"] >= 10:
+        if exceeded == "minute":
             raise HTTPException(
                 status_code=429,
-                detail="Rate limit exceeded: 10 requests per minute. Please try again later."
+                detail=f"Rate limit exceeded: {settings.AI_RATE_LIMIT_PER_MINUTE} requests per minute. Please try again later."
             )
 
-        # Check per-day limit
-        day_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        day_record = supabase.table("ai_rate_limits").select("*").eq(
-            "user_id", user_id
-        ).eq("window_type", "day").eq(
-            "window_start", day_start.isoformat()
-        ).execute()
-
-        if day_record.data and day_record.data[0]["request_count"] >= 100:
+        if exceeded == "day":
             raise HTTPException(
                 status_code=429,
-                detail="Rate limit exceeded: 100 requests per day. Please try again tomorrow."
+                detail=f"Rate limit exceeded: {settings.AI_RATE_LIMIT_PER_DAY} requests per day. Please try again tomorrow."
             )
 
-    async def increment_rate_limit(self, user_id: str):
-        """
-        Increment rate limit counters
-        """
-        supabase = get_supabase()
-
-        # Increment minute counter
-        minute_start = datetime.utcnow().replace(second=0, microsecond=0)
-        minute_record = supabase.table("ai_rate_limits").select("*").eq(
-            "user_id", user_id
-        ).eq("window_type", "minute").eq(
-            "window_start", minute_start.isoformat()
-        ).execute()
-
-        if minute_record.data:
-            supabase.table("ai_rate_limits").update({
-                "request_count": minute_record.data[0]["request_count"] + 1
-            }).eq("id", minute_record.data[0]["id"]).execute()
-        else:
-            supabase.table("ai_rate_limits").insert({
-                "user_id": user_id,
-                "window_type": "minute",
-                "window_start": minute_start.isoformat(),
-                "request_count": 1
-            }).execute()
-
-        # Increment day counter
-        day_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        day_record = supabase.table("ai_rate_limits").select("*").eq(
-            "user_id", user_id
-        ).eq("window_type", "day").eq(
-            "window_start", day_start.isoformat()
-        ).execute()
-
-        if day_record.data:
-            supabase.table("ai_rate_limits").update({
-                "request_count": day_record.data[0]["request_count"] + 1
-            }).eq("id", day_record.data[0]["id"]).execute()
-        else:
-            supabase.table("ai_rate_limits").insert({
-                "user_id": user_id,
-                "window_type": "day",
-                "window_start": day_start.isoformat(),
-                "request_count": 1
-            }).execute()
-
-    async def _call_llm(self, prompt: str, system_message: str = None) -> str:
+    async def _call_llm(self, prompt: str, system_message: str = None, max_tokens: int = 500) -> str:
         """
         Call LLM API (OpenAI or Anthropic)
+        Bounded by LLM_TOTAL_TIMEOUT, including the wait for a provider slot.
         """
+        if self.use_openai:
+            provider = "openai"
+        elif self.use_anthropic:
+            provider = "anthropic"
+        else:
+            # Fallback mock response for testing
+            return "AI feature not configured. Please add OpenAI or Anthropic API key."
+
         try:
-            if self.use_openai:
+            return await asyncio.wait_for(
+                self._request(provider, prompt, system_message, max_tokens),
+                timeout=settings.LLM_TOTAL_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise Exception(f"AI API call failed: timed out after {settings.LLM_TOTAL_TIMEOUT} seconds")
+        except Exception as e:
+            raise Exception(f"AI API call failed: {str(e)}")
+
+    async def _request(self, provider: str, prompt: str, system_message: str = None, max_tokens: int = 500) -> str:
+        async with get_provider_limit(provider):
+            if provider == "openai":
                 messages = []
                 if system_message:
                     messages.append({"role": "system", "content": system_message})
                 messages.append({"role": "user", "content": prompt})
 
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
+                response = await get_openai_client().chat.completions.create(
+                    model=settings.OPENAI_MODEL,
                     messages=messages,
                     temperature=0.7,
-                    max_tokens=500
+                    max_tokens=max_tokens
                 )
 
                 return response.choices[0].message.content.strip()
 
-            elif self.use_anthropic:
-                message = self.anthropic_client.messages.create(
-                    model="claude-3-haiku-20240307",
-                    max_tokens=500,
-                    system=system_message if system_message else "",
-                    messages=[{"role": "user", "content": prompt}]
-                )
-
-                return message.content[0].text.strip()
+            # Messages API lives under beta in the pinned anthropic SDK
+            message = await get_anthropic_client().beta.messages.create(
+                model=settings.ANTHROPIC_MODEL,
+                max_tokens=max_tokens,
+                system=system_message if system_message else "",
+                messages=[{"role": "user", "content": prompt}]
+            )
 
-            else:
-                # Fallback mock response for testing
-                return "AI feature not configured. Please add OpenAI or Anthropic API key."
+            return message.content[0].text.strip()
 
-        except Exception as e:
-            raise Exception(f"AI API call failed: {str(e)}")
-
-    async def generate_summary(self, description: str) -> str:
+    async def _stream_llm(self, prompt: str, system_message: str = None) -> AsyncIterator[str]:
         """
-        FR-040: AI Summary Generation
-        Generate a 2-4 sentence summary of issue description
+        Stream LLM output as text deltas
+        Holds a provider slot until the stream ends or is closed; each wait
+        for the next delta is bounded by what is left of LLM_TOTAL_TIMEOUT.
         """
+        if self.use_openai:
+            provider = "openai"
+        elif self.use_anthropic:
+            provider = "anthropic"
+        else:
+            yield "AI feature not configured. Please add OpenAI or Anthropic API key."
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.LLM_TOTAL_TIMEOUT
+
+        async def bounded(awaitable):
+            try:
+                return await asyncio.wait_for(awaitable, timeout=deadline - loop.time())
+            except asyncio.TimeoutError:
+                raise Exception(f"AI API call failed: timed out after {settings.LLM_TOTAL_TIMEOUT} seconds")
+
+        async with get_provider_limit(provider):
+            if provider == "openai":
+                messages = []
+                if system_message:
+                    messages.append({"role": "system", "content": system_message})
+                messages.append({"role": "user", "content": prompt})
+
+                stream = await bounded(get_openai_client().chat.completions.create(
+                    model=settings.OPENAI_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=500,
+                    stream=True
+                ))
+            else:
+                stream = await bounded(get_anthropic_client().beta.messages.create(
+                    model=settings.ANTHROPIC_MODEL,
+                    max_tokens=500,
+                    system=system_message if system_message else "",
+                    messages=[{"role": "user", "content": prompt}],
+                    stream=True
+                ))
+
+            try:
+                while True:
+                    try:
+                        chunk = await bounded(stream.__anext__())
+                    except StopAsyncIteration:
+                        break
+
+                    if provider == "openai":
+                        text = chunk.choices[0].delta.content if chunk.choices else None
+                    else:
+                        text = chunk.delta.text if chunk.type == "content_block_delta" else None
+
+                    if text:
+                        yield text
+            finally:
+                # Closes the provider connection when the client goes away early
+                await stream.response.aclose()
+
+    def _summary_prompt(self, description: str):
         prompt = f"""Summarize the following issue description in 2-4 sentences.
 Be concise and focus on the main points:
 
@@ -152,13 +185,22 @@ Summary:"""
 
         system_message = "You are a helpful assistant that summarizes technical issue descriptions concisely."
 
-        return await self._call_llm(prompt, system_message)
+        return prompt, system_message
 
-    async def generate_suggestion(self, title: str, description: str) -> str:
+    async def generate_summary(self, description: str) -> str:
         """
-        FR-041: AI Solution Suggestion
-        Suggest an approach to solve the issue
+        FR-040: AI Summary Generation
+        Generate a 2-4 sentence summary of issue description
+        """
+        return await self._call_llm(*self._summary_prompt(description))
+
+    def stream_summary(self, description: str) -> AsyncIterator[str]:
         """
+        FR-040: AI Summary Generation - streamed
+        """
+        return self._stream_llm(*self._summary_prompt(description))
+
+    def _suggestion_prompt(self, title: str, description: str):
         prompt = f"""Given this issue, suggest a practical approach to solve it:
 
 Title: {title}
@@ -169,7 +211,20 @@ Provide a clear, actionable solution approach in 3-5 bullet points:"""
 
         system_message = "You are a helpful technical advisor providing practical solutions to software issues."
 
-        return await self._call_llm(prompt, system_message)
+        return prompt, system_message
+
+    async def generate_suggestion(self, title: str, description: str) -> str:
+        """
+        FR-041: AI Solution Suggestion
+        Suggest an approach to solve the issue
+        """
+        return await self._call_llm(*self._suggestion_prompt(title, description))
+
+    def stream_suggestion(self, title: str, description: str) -> AsyncIterator[str]:
+        """
+        FR-041: AI Solution Suggestion - streamed
+        """
+        return self._stream_llm(*self._suggestion_prompt(title, description))
 
     async def recommend_labels(self, title: str, description: str, available_labels: List[Dict]) -> List[str]:
         """
@@ -194,7 +249,6 @@ Do not include any other text."""
             result = await self._call_llm(prompt, system_message)
 
             # Parse JSON response
-            import re
             # Extract JSON array from response
             json_match = re.search(r'\[.*?\]', result)
             if json_match:
@@ -214,52 +268,136 @@ Do not include any other text."""
             print(f"Label recommendation error: {str(e)}")
             return []
 
-    async def detect_duplicates(self, title: str, existing_issues: List[Dict]) -> List[Dict]:
+    def _pack_label_batches(self, issues: List[Dict], header: str, label_names: Dict[str, str]) -> List[List[Dict]]:
         """
-        FR-044: AI Duplicate Detection
-        Detect similar/duplicate issues
+        Split issues into as few prompts as AI_LABEL_BATCH_TOKEN_BUDGET
+        allows, at most AI_LABEL_BATCH_MAX_ISSUES per prompt
         """
-        if not existing_issues:
-            return []
+        batches = []
+        batch, used = [], estimate_tokens(header)
+        for issue in issues:
+            cost = estimate_tokens(self._label_entry(0, issue, label_names))
+            if batch and (
+                used + cost > settings.AI_LABEL_BATCH_TOKEN_BUDGET
+                or len(batch) >= settings.AI_LABEL_BATCH_MAX_ISSUES
+            ):
+                batches.append(batch)
+                batch, used = [], estimate_tokens(header)
+            batch.append(issue)
+            used += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _label_entry(self, number: int, issue: Dict, label_names: Dict[str, str]) -> str:
+        description = (issue.get("description") or "")[:settings.AI_LABEL_DESCRIPTION_CHARS]
+        current = [
+            label_names[row["label_id"]] for row in issue.get("issue_labels") or []
+            if row["label_id"] in label_names
+        ]
+        return (
+            f"[{number}] Title: {issue['title']}\nDescription: {description}\n"
+            f"Current labels: {', '.join(current) or 'none'}\n"
+        )
+
+    async def _recommend_label_batch(self, header: str, issues: List[Dict], available_labels: List[Dict]) -> Dict[str, List[str]]:
+        label_names = {label["id"]: label["name"] for label in available_labels}
+        entries = "\n".join(self._label_entry(n, issue, label_names) for n, issue in enumerate(issues, 1))
+        prompt = f"""{header}
+
+{entries}
+Return ONLY a JSON object mapping each issue number to a JSON array of label names, like: {{"1": ["label1", "label2"], "2": []}}
+Do not include any other text."""
 
-        # Simple text similarity for now
-        # In production, use embeddings or more sophisticated matching
-        similar_issues = []
+        system_message = "You are a label recommendation system. Return only valid JSON objects."
+
+        # Room for every issue's answer; one call per batch
+        result = await self._call_llm(
+            prompt, system_message, max_tokens=LABEL_TOKENS_PER_ISSUE * len(issues) + 50
+        )
+
+        json_match = re.search(r'\{.*\}', result, re.DOTALL)
+        if not json_match:
+            raise ValueError("No JSON object in response")
+        recommended = json.loads(json_match.group())
+
+        label_ids = {label["name"].lower(): label["id"] for label in available_labels}
+        labels_by_issue = {}
+        for number, issue in enumerate(issues, 1):
+            names = recommended.get(str(number)) or []
+            ids = []
+            for name in names:
+                label_id = label_ids.get(str(name).strip().lower())
+                if label_id and label_id not in ids:
+                    ids.append(label_id)
+            labels_by_issue[issue["id"]] = ids[:3]  # Max 3 recommendations
+        return labels_by_issue
+
+    async def recommend_labels_batch(self, issues: List[Dict], available_labels: List[Dict]) -> Dict[str, List[str]]:
+        """
+        FR-043: AI Auto-Label
+        Recommend labels for many issues, packing as many issues into each
+        LLM call as the token budget allows. Returns label ids per issue id;
+        issues in a batch that fails get no recommendations.
+        """
+        labels_text = ", ".join([f"{label['name']}" for label in available_labels])
+        header = f"""Based on each issue below, recommend up to 3 most relevant labels from the available options that the issue does not already have.
+
+Available labels: {labels_text}"""
+
+        label_names = {label["id"]: label["name"] for label in available_labels}
+        batches = self._pack_label_batches(issues, header, label_names)
+        results = await asyncio.gather(
+            *[self._recommend_label_batch(header, batch, available_labels) for batch in batches],
+            return_exceptions=True
+        )
+
+        labels_by_issue = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"Label recommendation error: {str(result)}")
+                result = {}
+            for issue in batch:
+                labels_by_issue[issue["id"]] = result.get(issue["id"], [])
+        return labels_by_issue
+
+    async def summarize_comment_chunk(self, comments: List[Dict]) -> str:
+        """
+        FR-045: AI Comment Summary
+        Summarize one chunk of a long thread, to be combined with the others
+        """
+        comments_joined = "\n".join(f"- {comment['content']}" for comment in comments)
 
-        title_lower = title.lower()
-        words = set(title_lower.split())
+        prompt = f"""Summarize the following part of a discussion in 2-3 sentences.
+Keep key points, decisions, open questions and action items:
 
-        for issue in existing_issues[:50]:  # Check last 50 issues
-            issue_title_lower = issue["title"].lower()
-            issue_words = set(issue_title_lower.split())
+{comments_joined}
 
-            # Calculate word overlap
-            overlap = len(words & issue_words)
-            similarity = overlap / max(len(words), len(issue_words)) if words or issue_words else 0
+Summary:"""
 
-            if similarity > 0.5:  # 50% similarity threshold
-                similar_issues.append({
-                    "id": issue["id"],
-                    "title": issue["title"],
-                    "similarity": round(similarity * 100, 2)
-                })
+        system_message = "You are a helpful assistant that summarizes discussion threads, highlighting key decisions and action items."
 
-        # Return top 3 most similar
-        similar_issues.sort(key=lambda x: x["similarity"], reverse=True)
-        return similar_issues[:3]
+        return await self._call_llm(prompt, system_message)
 
-    async def summarize_comments(self, comments: List[Dict]) -> str:
+    async def summarize_comments(self, comments: List[Dict], earlier_summaries: List[str] = None) -> str:
         """
         FR-045: AI Comment Summary
-        Summarize discussion in comments
+        Summarize discussion in comments, starting from the summaries of
+        earlier parts of the thread when there are any
         """
-        comment_texts = [f"- {comment['content']}" for comment in comments[:20]]  # Limit to 20 comments
-        comments_joined = "\n".join(comment_texts)
-
-        prompt = f"""Summarize the following discussion comments in 3-5 sentences.
+        sections = []
+        if earlier_summaries:
+            earlier_joined = "\n".join(f"- {summary}" for summary in earlier_summaries)
+            sections.append(f"Summaries of earlier parts of the discussion, oldest first:\n{earlier_joined}")
+        if comments:
+            comments_joined = "\n".join(f"- {comment['content']}" for comment in comments)
+            sections.append(f"Latest comments:\n{comments_joined}")
+        discussion = "\n\n".join(sections)
+
+        prompt = f"""Summarize the following discussion in 3-5 sentences.
 Focus on key points, decisions, and action items:
 
-{comments_joined}
+{discussion}
 
 Summary:"""
 
@@ -1,3 +1,4 @@
+from src.database.repository import get_db, get_admin_db
 from src.database.supabase import get_supabase, get_supabase_admin
 from src.config import settings
 from src.services.email_service import EmailService
@@ -62,7 +63,8 @@ class AuthService:
                 raise Exception("Invalid credentials")
 
             # Get user profile
-            profile = supabase.table("user_profiles").select("*").eq(
+            db = get_db()
+            profile = await db.table("user_profiles").select("*").eq(
                 "id", str(auth_response.user.id)
             ).is_("deleted_at", "null").single().execute()
 
@@ -80,10 +82,10 @@ class AuthService:
         FR-003: Password Recovery/Reset
         """
         try:
-            supabase = get_supabase_admin()
+            db = get_admin_db()
 
             # Check if user exists
-            user_response = supabase.table("user_profiles").select("*").eq(
+            user_response = await db.table("user_profiles").select("*").eq(
                 "email", email
             ).is_("deleted_at", "null").execute()
 
@@ -98,7 +100,7 @@ class AuthService:
             expires_at = datetime.utcnow() + timedelta(hours=1)
 
             # Save token to database
-            supabase.table("password_reset_tokens").insert({
+            await db.table("password_reset_tokens").insert({
                 "user_id": user["id"],
                 "token": reset_token,
                 "expires_at": expires_at.isoformat(),
@@ -119,10 +121,10 @@ class AuthService:
         FR-003: Password Recovery/Reset - Confirm
         """
         try:
-            supabase = get_supabase_admin()
+            db = get_admin_db()
 
             # Verify token
-            token_response = supabase.table("password_reset_tokens").select("*").eq(
+            token_response = await db.table("password_reset_tokens").select("*").eq(
                 "token", token
             ).eq("used", False).execute()
 
@@ -136,13 +138,14 @@ class AuthService:
                 raise Exception("Token expired")
 
             # Update password
+            supabase = get_supabase_admin()
             supabase.auth.admin.update_user_by_id(
                 token_data["user_id"],
                 {"password": new_password}
             )
 
             # Mark token as used
-            supabase.table("password_reset_tokens").update({
+            await db.table("password_reset_tokens").update({
                 "used": True
             }).eq("id", token_data["id"]).execute()
 
@@ -154,10 +157,11 @@ class AuthService:
         FR-006: Password Change
         """
         try:
+            db = get_db()
             supabase = get_supabase()
 
             # Get user email
-            user = supabase.table("user_profiles").select("email, auth_provider").eq(
+            user = await db.table("user_profiles").select("email, auth_provider").eq(
                 "id", user_id
             ).single().execute()
 
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from src.config import settings
+from src.database.redis import get_redis
+from typing import Any, Hashable, Optional
+import json
+import time
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry expiry and LRU eviction.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class MemoryCache:
+    """
+    Async cache backend held in this process.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any):
+        self._cache.set(key, value)
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+class RedisCache:
+    """
+    Async cache backend shared by all workers through Redis, so an
+    invalidation in one worker is seen by every other. Uses the in-process
+    fallback while Redis is not reachable.
+    """
+    def __init__(self, namespace: str, ttl: float, fallback: MemoryCache):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.fallback = fallback
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Any:
+        client = get_redis()
+        if client is None:
+            return await self.fallback.get(key)
+
+        try:
+            value = await client.get(self._key(key))
+        except Exception as e:
+            print(f"Cache read failed: {str(e)}")
+            return None
+
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any):
+        client = get_redis()
+        if client is None:
+            return await self.fallback.set(key, value)
+
+        try:
+            await client.set(self._key(key), json.dumps(value), ex=int(self.ttl))
+        except Exception as e:
+            print(f"Cache write failed: {str(e)}")
+
+    async def delete(self, key: str):
+        client = get_redis()
+        if client is None:
+            return await self.fallback.delete(key)
+
+        try:
+            await client.delete(self._key(key))
+        except Exception as e:
+            # Entry expires on its own after the TTL
+            print(f"Cache invalidation failed: {str(e)}")
+
+def create_cache(namespace: str, maxsize: int, ttl: float):
+    """
+    Build the cache backend selected by CACHE_BACKEND ("memory" or "redis").
+    """
+    fallback = MemoryCache(maxsize=maxsize, ttl=ttl)
+
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(namespace, ttl, fallback)
+
+    return fallback
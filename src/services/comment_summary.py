@@ -0,0 +1,160 @@
+from src.config import settings
+from src.database.repository import get_admin_db
+from src.services.ai_service import AIService
+from dateutil.parser import isoparse
+from typing import List, Optional, Tuple
+from uuid import UUID
+import asyncio
+
+def _position(created_at: str, comment_id: str) -> tuple:
+    # Same order as PostgreSQL's (created_at, id) row comparison
+    return isoparse(created_at), UUID(comment_id)
+
+class CommentSummarizer:
+    """
+    Incremental map-reduce summaries of comment threads (FR-045).
+    Comments are grouped into chunks of COMMENT_SUMMARY_CHUNK_SIZE whose
+    summaries are stored in comment_summary_chunks; the thread summary
+    combines those with the comments after the last chunk and is stored
+    in comment_summaries. Triggers on comments clear the thread summary
+    on any change and a chunk's summary when one of its comments is
+    edited or deleted, so a refresh reads only the newest comments and
+    changed chunks, and usually costs a single LLM call.
+    """
+    def __init__(self, ai_service: AIService):
+        self.ai_service = ai_service
+
+    async def get_cached(self, issue_id) -> Tuple[Optional[str], int]:
+        """
+        Return the stored summary (None if stale) and its version.
+        """
+        db = get_admin_db()
+        result = await db.table("comment_summaries").select(
+            "summary, model, version"
+        ).eq("issue_id", str(issue_id)).execute()
+
+        if not result.data:
+            return None, 0
+
+        state = result.data[0]
+        if state["summary"] is None or state["model"] != self.ai_service.model:
+            return None, state["version"]
+        return state["summary"], state["version"]
+
+    async def _comments_after(self, issue_id, chunk: Optional[dict]) -> List[dict]:
+        db = get_admin_db()
+        query = db.table("comments").select("id, content, created_at").eq(
+            "issue_id", str(issue_id)
+        ).is_("deleted_at", "null")
+
+        if chunk:
+            created_at, comment_id = chunk["end_created_at"], chunk["end_id"]
+            query = query.gte("created_at", created_at).or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt.{comment_id})'
+            )
+
+        result = await query.order("created_at,id").execute()
+        return result.data
+
+    async def _comments_in(self, issue_id, chunk: dict) -> List[dict]:
+        db = get_admin_db()
+        result = await db.table("comments").select("id, content, created_at").eq(
+            "issue_id", str(issue_id)
+        ).is_("deleted_at", "null").gte(
+            "created_at", chunk["start_created_at"]
+        ).lte(
+            "created_at", chunk["end_created_at"]
+        ).order("created_at,id").execute()
+
+        # The timestamp bounds are inclusive; ids settle ties at either end
+        start = _position(chunk["start_created_at"], chunk["start_id"])
+        end = _position(chunk["end_created_at"], chunk["end_id"])
+        return [
+            comment for comment in result.data
+            if start <= _position(comment["created_at"], comment["id"]) <= end
+        ]
+
+    async def _refresh_chunk(self, issue_id, chunk: dict) -> Optional[str]:
+        db = get_admin_db()
+        comments = await self._comments_in(issue_id, chunk)
+
+        if not comments:
+            # Every comment in the range was deleted
+            await db.table("comment_summary_chunks").delete().eq("id", chunk["id"]).execute()
+            return None
+
+        summary = await self.ai_service.summarize_comment_chunk(comments)
+
+        # Skipped if a comment in the range changed while summarizing
+        await db.table("comment_summary_chunks").update({
+            "summary": summary,
+            "model": self.ai_service.model
+        }).eq("id", chunk["id"]).eq("version", chunk["version"]).execute()
+
+        return summary
+
+    async def _seal_chunk(self, issue_id, comments: List[dict]) -> str:
+        db = get_admin_db()
+        summary = await self.ai_service.summarize_comment_chunk(comments)
+
+        # Another refresh may have sealed this range first; its row is kept
+        await db.table("comment_summary_chunks").upsert({
+            "issue_id": str(issue_id),
+            "start_created_at": comments[0]["created_at"],
+            "start_id": comments[0]["id"],
+            "end_created_at": comments[-1]["created_at"],
+            "end_id": comments[-1]["id"],
+            "summary": summary,
+            "model": self.ai_service.model
+        }, on_conflict="issue_id,start_created_at,start_id", ignore_duplicates=True).execute()
+
+        return summary
+
+    async def refresh(self, issue_id, version: int) -> str:
+        """
+        Bring the thread summary up to date and store it, unless a comment
+        changed again since version was read.
+        """
+        model = self.ai_service.model
+        if model is None:
+            # Nothing worth storing without a provider
+            return await self.ai_service.summarize_comments([])
+
+        db = get_admin_db()
+        chunks = await db.table("comment_summary_chunks").select("*").eq(
+            "issue_id", str(issue_id)
+        ).order("start_created_at,start_id").execute()
+        chunks = chunks.data
+
+        tail = await self._comments_after(issue_id, chunks[-1] if chunks else None)
+
+        # Comments beyond one chunk's worth after the last chunk become new chunks
+        size = settings.COMMENT_SUMMARY_CHUNK_SIZE
+        new_chunks = []
+        while len(tail) > size:
+            new_chunks.append(tail[:size])
+            tail = tail[size:]
+
+        # Map: summarize changed and new chunks concurrently
+        stale = [c for c in chunks if c["summary"] is None or c["model"] != model]
+        summaries = await asyncio.gather(
+            *[self._refresh_chunk(issue_id, chunk) for chunk in stale],
+            *[self._seal_chunk(issue_id, comments) for comments in new_chunks]
+        )
+        refreshed = dict(zip([c["id"] for c in stale], summaries))
+
+        chunk_summaries = [refreshed.get(c["id"], c["summary"]) for c in chunks]
+        chunk_summaries += summaries[len(stale):]
+        chunk_summaries = [summary for summary in chunk_summaries if summary is not None]
+
+        # Reduce: one call over the chunk summaries and the latest comments
+        summary = await self.ai_service.summarize_comments(tail, chunk_summaries)
+
+        await db.table("comment_summaries").update({
+            "summary": summary,
+            "model": model,
+            "updated_at": "now()"
+        }).eq("issue_id", str(issue_id)).eq("version", version).execute()
+
+        return summary
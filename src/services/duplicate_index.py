@@ -0,0 +1,127 @@
+from src.config import settings
+from src.database.repository import get_admin_db
+from src.services.cache import TTLCache
+from typing import Dict, List, Optional, Set
+import asyncio
+import re
+
+SIMILARITY_THRESHOLD = 0.5
+MAX_RESULTS = 3
+
+def tokenize(text: str) -> Set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / max(len(a), len(b))
+
+class ProjectIndex:
+    """
+    Inverted index from title words to the live issues of one project.
+    """
+    def __init__(self):
+        self.titles: Dict[str, str] = {}
+        self.tokens: Dict[str, Set[str]] = {}
+        self.postings: Dict[str, Set[str]] = {}
+
+    def add(self, issue_id: str, title: str):
+        self.remove(issue_id)
+
+        tokens = tokenize(title)
+        self.titles[issue_id] = title
+        self.tokens[issue_id] = tokens
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(issue_id)
+
+    def remove(self, issue_id: str):
+        self.titles.pop(issue_id, None)
+        for token in self.tokens.pop(issue_id, set()):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.discard(issue_id)
+                if not posting:
+                    del self.postings[token]
+
+    def query(self, title: str) -> List[Dict]:
+        tokens = tokenize(title)
+        if not tokens:
+            return []
+
+        # Any title above the threshold shares at least one word with the
+        # query, so scoring only those is exact, not an approximation
+        candidates = set()
+        for token in tokens:
+            candidates |= self.postings.get(token, set())
+
+        similar_issues = []
+        for issue_id in candidates:
+            score = similarity(tokens, self.tokens[issue_id])
+            if score > SIMILARITY_THRESHOLD:
+                similar_issues.append({
+                    "id": issue_id,
+                    "title": self.titles[issue_id],
+                    "similarity": round(score * 100, 2)
+                })
+
+        similar_issues.sort(key=lambda x: x["similarity"], reverse=True)
+        return similar_issues[:MAX_RESULTS]
+
+class DuplicateIndex:
+    """
+    Per-project inverted index of issue titles used for duplicate
+    detection. A project's index is built from its issue titles on first
+    lookup and then kept current by the issue create/update/delete
+    endpoints. Indexes expire
+    after DUPLICATE_INDEX_TTL so edits made through other workers are
+    picked up.
+    """
+    def __init__(self):
+        self.projects = TTLCache(
+            maxsize=settings.DUPLICATE_INDEX_PROJECTS,
+            ttl=settings.DUPLICATE_INDEX_TTL
+        )
+        self._builds: Dict[str, asyncio.Task] = {}
+
+    async def _build(self, project_id: str) -> ProjectIndex:
+        db = get_admin_db()
+        issues = await db.table("issues").select("id, title").eq(
+            "project_id", project_id
+        ).is_("deleted_at", "null").execute()
+
+        index = ProjectIndex()
+        for issue in issues.data:
+            index.add(issue["id"], issue["title"])
+
+        self.projects.set(project_id, index)
+        return index
+
+    async def _get(self, project_id: str) -> ProjectIndex:
+        index = self.projects.get(project_id)
+        if index is not None:
+            return index
+
+        # Concurrent lookups on a cold project share one build
+        task = self._builds.get(project_id)
+        if task is None:
+            task = asyncio.ensure_future(self._build(project_id))
+            self._builds[project_id] = task
+            task.add_done_callback(lambda _: self._builds.pop(project_id, None))
+        return await asyncio.shield(task)
+
+    async def find_similar(self, project_id, title: str) -> List[Dict]:
+        index = await self._get(str(project_id))
+        return index.query(title)
+
+    def add(self, project_id, issue_id, title: str):
+        # Projects not indexed yet read the change when they are built
+        index: Optional[ProjectIndex] = self.projects.get(str(project_id))
+        if index is not None:
+            index.add(str(issue_id), title)
+
+    def remove(self, project_id, issue_id):
+        index: Optional[ProjectIndex] = self.projects.get(str(project_id))
+        if index is not None:
+            index.remove(str(issue_id))
+
+duplicate_index = DuplicateIndex()
@@ -0,0 +1,128 @@
+from src.config import settings
+from src.database.repository import get_admin_db
+from src.services.email_transport import EmailTransport, create_email_transport
+from datetime import datetime, timedelta
+from typing import Optional
+import asyncio
+import time
+
+class EmailOutboxWorker:
+    """
+    Sends queued emails from the email_outbox table in the background.
+    Due rows are claimed in batches, sent through the configured transport
+    no faster than EMAIL_MAX_PER_SECOND, and failures are retried with
+    exponential backoff up to EMAIL_MAX_ATTEMPTS.
+    """
+    def __init__(self, transport: Optional[EmailTransport] = None):
+        self.transport = transport
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    async def enqueue(self, to_email: str, subject: str, html_content: str) -> dict:
+        """
+        Queue an email and wake the worker.
+        """
+        db = get_admin_db()
+
+        result = await db.table("email_outbox").insert({
+            "to_email": to_email,
+            "subject": subject,
+            "html_content": html_content
+        }).execute()
+
+        self._wakeup.set()
+        return result.data[0]
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        delay = settings.EMAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1)
+        return timedelta(seconds=min(delay, settings.EMAIL_RETRY_MAX_DELAY))
+
+    async def process_batch(self) -> int:
+        """
+        Claim, send and record one batch. Returns the number of emails claimed.
+        """
+        db = get_admin_db()
+        batch_size = min(settings.EMAIL_BATCH_SIZE, self.transport.max_batch_size)
+
+        claimed = await db.rpc("claim_email_outbox", {
+            "p_limit": batch_size,
+            "p_lease_seconds": settings.EMAIL_CLAIM_LEASE
+        }).execute()
+        messages = claimed.data or []
+        if not messages:
+            return 0
+
+        errors = await self.transport.send_batch(messages)
+
+        sent_ids = [m["id"] for m, error in zip(messages, errors) if error is None]
+        updates = []
+        if sent_ids:
+            updates.append(db.table("email_outbox").update({
+                "status": "sent",
+                "sent_at": "now()",
+                "locked_until": None,
+                "last_error": None
+            }).in_("id", sent_ids).execute())
+
+        for message, error in zip(messages, errors):
+            if error is None:
+                continue
+            if message["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+                update = {"status": "failed", "locked_until": None, "last_error": error}
+                print(f"Email to {message['to_email']} failed permanently: {error}")
+            else:
+                next_attempt_at = datetime.utcnow() + self.retry_delay(message["attempts"])
+                update = {
+                    "status": "pending",
+                    "next_attempt_at": next_attempt_at.isoformat() + "Z",
+                    "locked_until": None,
+                    "last_error": error
+                }
+            updates.append(db.table("email_outbox").update(update).eq(
+                "id", message["id"]
+            ).execute())
+
+        await asyncio.gather(*updates)
+        return len(messages)
+
+    async def _run(self):
+        while True:
+            # Cleared before claiming so an enqueue during the batch is not missed
+            self._wakeup.clear()
+            try:
+                started = time.monotonic()
+                count = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Email outbox error: {str(e)}")
+                count = 0
+
+            if count:
+                # Rate ceiling: a batch of n emails occupies n / rate seconds
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, count / settings.EMAIL_MAX_PER_SECOND - elapsed))
+                continue
+
+            # Idle: wait for an enqueue in this process or the next poll
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            if self.transport is None:
+                self.transport = create_email_transport()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+email_outbox = EmailOutboxWorker()
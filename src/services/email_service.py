@@ -1,30 +1,13 @@
-import resend
-from src.config import settings
+from src.services.email_outbox import email_outbox
 
 class EmailService:
-    def __init__(self):
-        self.from_email = settings.FROM_EMAIL
-        resend.api_key = settings.RESEND_API_KEY
-
     async def send_email(self, to_email: str, subject: str, html_content: str):
         """
-        Send email using Resend
+        Queue email in the outbox; the outbox worker delivers it
         FR-003, FR-013: Actual email sending required
         """
-        try:
-            params = {
-                "from": self.from_email,
-                "to": [to_email],
-                "subject": subject,
-                "html": html_content,
-            }
-
-            email = resend.Emails.send(params)
-            return True
-
-        except Exception as e:
-            print(f"Email sending failed: {str(e)}")
-            raise Exception(f"Failed to send email: {str(e)}")
+        await email_outbox.enqueue(to_email, subject, html_content)
+        return True
 
     async def send_password_reset_email(self, to_email: str, reset_link: str):
         """
@@ -0,0 +1,111 @@
+from src.config import settings
+from fastapi.concurrency import run_in_threadpool
+from email.message import EmailMessage
+from typing import List, Optional
+from abc import ABC, abstractmethod
+import json
+import os
+import smtplib
+import resend
+
+class EmailTransport(ABC):
+    """
+    Delivers a batch of outbox emails. send_batch returns one entry per
+    message: None when it was sent, or the error text to retry with.
+    """
+    # Largest batch the provider accepts in one call
+    max_batch_size = 100
+
+    @abstractmethod
+    async def send_batch(self, messages: List[dict]) -> List[Optional[str]]:
+        ...
+
+class ResendTransport(EmailTransport):
+    """
+    Sends through the Resend batch API, one HTTP call per batch.
+    """
+    max_batch_size = 100
+
+    def __init__(self):
+        resend.api_key = settings.RESEND_API_KEY
+
+    async def send_batch(self, messages: List[dict]) -> List[Optional[str]]:
+        params = [
+            {
+                "from": settings.FROM_EMAIL,
+                "to": [m["to_email"]],
+                "subject": m["subject"],
+                "html": m["html_content"],
+            }
+            for m in messages
+        ]
+
+        try:
+            # The Resend SDK is synchronous
+            await run_in_threadpool(resend.Batch.send, params)
+            return [None] * len(messages)
+        except Exception as e:
+            # A rejected batch sends nothing, so every message is retried
+            return [str(e)] * len(messages)
+
+class SMTPTransport(EmailTransport):
+    """
+    Sends over one SMTP connection per batch. Pointed at a local catcher
+    (e.g. MailHog on localhost:1025) it stands in for the provider.
+    """
+    def _send(self, messages: List[dict]) -> List[Optional[str]]:
+        results = []
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as smtp:
+            for m in messages:
+                msg = EmailMessage()
+                msg["From"] = settings.FROM_EMAIL
+                msg["To"] = m["to_email"]
+                msg["Subject"] = m["subject"]
+                msg.set_content(m["html_content"], subtype="html")
+                try:
+                    smtp.send_message(msg)
+                    results.append(None)
+                except smtplib.SMTPException as e:
+                    results.append(str(e))
+        return results
+
+    async def send_batch(self, messages: List[dict]) -> List[Optional[str]]:
+        try:
+            return await run_in_threadpool(self._send, messages)
+        except Exception as e:
+            return [str(e)] * len(messages)
+
+class FileTransport(EmailTransport):
+    """
+    Appends emails as JSON lines to a local file instead of sending them.
+    For development and tests.
+    """
+    def _write(self, messages: List[dict]):
+        directory = os.path.dirname(settings.EMAIL_FILE_SINK_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(settings.EMAIL_FILE_SINK_PATH, "a") as f:
+            for m in messages:
+                f.write(json.dumps({
+                    "from": settings.FROM_EMAIL,
+                    "to": m["to_email"],
+                    "subject": m["subject"],
+                    "html": m["html_content"],
+                }) + "\n")
+
+    async def send_batch(self, messages: List[dict]) -> List[Optional[str]]:
+        try:
+            await run_in_threadpool(self._write, messages)
+            return [None] * len(messages)
+        except Exception as e:
+            return [str(e)] * len(messages)
+
+def create_email_transport() -> EmailTransport:
+    """
+    Build the transport selected by EMAIL_TRANSPORT.
+    """
+    if settings.EMAIL_TRANSPORT == "smtp":
+        return SMTPTransport()
+    if settings.EMAIL_TRANSPORT == "file":
+        return FileTransport()
+    return ResendTransport()
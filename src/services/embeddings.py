@@ -0,0 +1,96 @@
+from src.config import settings
+from src.services.llm_client import get_openai_client, get_provider_limit
+from typing import List
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import numpy as np
+import re
+
+class EmbeddingProvider(ABC):
+    """
+    Turns a batch of texts into one L2-normalised vector per text, as a
+    float32 matrix of shape (len(texts), dimensions).
+    """
+    model = ""
+    # Largest batch the provider accepts in one call
+    max_batch_size = 100
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        ...
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class OpenAIEmbedder(EmbeddingProvider):
+    """
+    Embeds through the OpenAI embeddings API, one call per batch.
+    """
+    max_batch_size = 256
+
+    def __init__(self):
+        self.model = settings.EMBEDDING_MODEL
+
+    async def _request(self, texts: List[str]) -> np.ndarray:
+        async with get_provider_limit("openai"):
+            response = await get_openai_client().embeddings.create(
+                model=self.model,
+                input=texts
+            )
+
+        data = sorted(response.data, key=lambda d: d.index)
+        return np.array([d.embedding for d in data], dtype=np.float32)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        try:
+            vectors = await asyncio.wait_for(
+                self._request(texts),
+                timeout=settings.LLM_TOTAL_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise Exception(f"Embedding call failed: timed out after {settings.LLM_TOTAL_TIMEOUT} seconds")
+        except Exception as e:
+            raise Exception(f"Embedding call failed: {str(e)}")
+
+        return normalize(vectors)
+
+class HashingEmbedder(EmbeddingProvider):
+    """
+    Deterministic local embedder: words and character trigrams hashed into
+    a fixed number of signed buckets. Needs no network or API key, so it
+    backs development and tests; it matches shared wording, not meaning.
+    """
+    max_batch_size = 1000
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+
+    def _features(self, text: str) -> List[str]:
+        words = re.findall(r"\w+", text.lower())
+        features = list(words)
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dimensions] += sign
+        return normalize(vectors)
+
+def create_embedding_provider() -> EmbeddingProvider:
+    """
+    Build the provider selected by EMBEDDING_PROVIDER. Falls back to the
+    hashing embedder when OpenAI is selected but not configured.
+    """
+    if settings.EMBEDDING_PROVIDER == "openai" and settings.OPENAI_API_KEY:
+        return OpenAIEmbedder()
+    return HashingEmbedder(settings.EMBEDDING_DIMENSIONS)
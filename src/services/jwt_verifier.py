@@ -0,0 +1,106 @@
+from src.config import settings
+from typing import Optional
+import asyncio
+import httpx
+import jwt
+
+class TokenVerificationError(Exception):
+    pass
+
+class JWTVerifier:
+    """
+    Verifies Supabase access tokens locally instead of calling the Auth API.
+    HS256 tokens are checked against SUPABASE_JWT_SECRET, asymmetric tokens
+    against the project's JWKS, which is cached and refreshed in the background.
+    """
+    def __init__(self):
+        self.secret = settings.SUPABASE_JWT_SECRET
+        self.audience = settings.SUPABASE_JWT_AUDIENCE
+        self.jwks_url = f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+        self._keys = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def verify(self, token: str) -> Optional[dict]:
+        """
+        Check signature, expiry and audience of an access token.
+        Returns the claims, or None when no key material is available to
+        verify this token locally (caller should fall back to the Auth API).
+        Raises TokenVerificationError when the token is invalid.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(str(e))
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.secret:
+                return None
+            key = self.secret
+        else:
+            cached = self._keys.get(header.get("kid"))
+            if cached is None:
+                return None
+            key, algorithm = cached
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"require": ["exp", "sub"]}
+            )
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(str(e))
+
+    async def refresh_jwks(self):
+        """
+        Fetch the project's signing keys
+        """
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(
+                    self.jwks_url,
+                    headers={"apikey": settings.SUPABASE_KEY}
+                )
+                response.raise_for_status()
+
+            # kid -> (public key, algorithm); the algorithm comes from the
+            # key itself, never from the token being verified
+            keys = {}
+            for key_data in response.json().get("keys", []):
+                algorithm = key_data.get("alg")
+                if not algorithm:
+                    continue
+                try:
+                    jwk = jwt.PyJWK(key_data, algorithm)
+                except jwt.PyJWTError:
+                    continue
+                keys[jwk.key_id] = (jwk.key, algorithm)
+
+            self._keys = keys
+
+        except Exception as e:
+            # Keep the previous key set; tokens fall back to the Auth API if empty
+            print(f"JWKS refresh failed: {str(e)}")
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh_jwks()
+            await asyncio.sleep(settings.JWKS_REFRESH_INTERVAL)
+
+    def start(self):
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+jwt_verifier = JWTVerifier()
@@ -0,0 +1,75 @@
+from src.config import settings
+from typing import Dict
+import asyncio
+import httpx
+import openai
+
+# One connection pool shared by every provider client
+http_client: httpx.AsyncClient = None
+openai_client: openai.AsyncOpenAI = None
+anthropic_client = None
+
+# Per-provider cap on in-flight model calls
+provider_limits: Dict[str, asyncio.Semaphore] = {}
+
+def init_llm_clients():
+    """
+    Create the async provider clients on a shared, pooled HTTP client.
+    """
+    global http_client, openai_client, anthropic_client, provider_limits
+
+    timeout = httpx.Timeout(
+        connect=settings.LLM_CONNECT_TIMEOUT,
+        read=settings.LLM_READ_TIMEOUT,
+        write=settings.LLM_CONNECT_TIMEOUT,
+        pool=settings.LLM_CONNECT_TIMEOUT
+    )
+    http_client = httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+        )
+    )
+
+    if settings.OPENAI_API_KEY:
+        openai_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=http_client,
+            timeout=timeout,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+
+    if settings.ANTHROPIC_API_KEY:
+        try:
+            import anthropic
+            anthropic_client = anthropic.AsyncAnthropic(
+                api_key=settings.ANTHROPIC_API_KEY,
+                http_client=http_client,
+                timeout=timeout,
+                max_retries=settings.LLM_MAX_RETRIES
+            )
+        except ImportError:
+            print("Warning: anthropic package not installed")
+
+    provider_limits = {
+        "openai": asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY),
+        "anthropic": asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    }
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    return openai_client
+
+def get_anthropic_client():
+    return anthropic_client
+
+def get_provider_limit(provider: str) -> asyncio.Semaphore:
+    return provider_limits[provider]
+
+async def close_llm_clients():
+    global http_client, openai_client, anthropic_client
+    if http_client is not None:
+        await http_client.aclose()
+    http_client = None
+    openai_client = None
+    anthropic_client = None
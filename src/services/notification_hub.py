@@ -0,0 +1,86 @@
+from src.config import settings
+from src.database.redis import get_redis
+from typing import Dict, Optional, Set
+import asyncio
+import json
+
+class NotificationHub:
+    """
+    In-process pub/sub for notification events, keyed by user id.
+    Each open stream subscribes a bounded queue. With Redis available,
+    events are published to one channel and every worker delivers them to
+    its own subscribers; without Redis, delivery stays in this process.
+    """
+    CHANNEL = "notifications:events"
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    async def publish(self, user_id: str, event: str, data: dict):
+        """
+        Send an event to every stream of a user, across workers when bridged.
+        """
+        message = {"user_id": user_id, "event": event, "data": data}
+
+        redis = get_redis()
+        if redis is not None and self._listener_task is not None:
+            try:
+                await redis.publish(self.CHANNEL, json.dumps(message, default=str))
+                return
+            except Exception as e:
+                print(f"Notification publish failed, delivering locally: {str(e)}")
+
+        self._deliver(message)
+
+    def _deliver(self, message: dict):
+        for queue in self._subscribers.get(message["user_id"], ()):
+            if queue.full():
+                # A slow client loses its oldest event rather than stalling others
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def _listen(self):
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                async for item in pubsub.listen():
+                    if item["type"] == "message":
+                        self._deliver(json.loads(item["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Notification bridge error, reconnecting: {str(e)}")
+            finally:
+                # Release the connection before the next attempt opens another
+                await pubsub.aclose()
+            await asyncio.sleep(1)
+
+    def start(self):
+        if self._listener_task is None and get_redis() is not None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+notification_hub = NotificationHub()
@@ -0,0 +1,55 @@
+from src.database.repository import get_db
+from src.services.notification_hub import notification_hub
+from typing import Optional
+
+class NotificationService:
+    async def create_notification(
+        self,
+        user_id: str,
+        type: str,
+        title: str,
+        message: str,
+        link: Optional[str] = None
+    ) -> dict:
+        """
+        Store a notification and push it to the user's open streams.
+        FR-090: In-App Notification
+        """
+        db = get_db()
+
+        result = await db.table("notifications").insert({
+            "user_id": user_id,
+            "type": type,
+            "title": title,
+            "message": message,
+            "link": link
+        }).execute()
+
+        notification = result.data[0]
+        await notification_hub.publish(user_id, "notification", notification)
+        await self.publish_unread_count(user_id)
+
+        return notification
+
+    async def get_unread_count(self, user_id: str) -> int:
+        """
+        Read the unread counter maintained by the notifications trigger.
+        """
+        db = get_db()
+
+        state = await db.table("notification_read_state").select("unread_count").eq(
+            "user_id", user_id
+        ).execute()
+
+        return state.data[0]["unread_count"] if state.data else 0
+
+    async def publish_unread_count(self, user_id: str):
+        """
+        Push the current unread count to the user's open streams.
+        """
+        try:
+            count = await self.get_unread_count(user_id)
+            await notification_hub.publish(user_id, "unread_count", {"unread_count": count})
+        except Exception as e:
+            # Streams resync on reconnect; a missed count is not an error
+            print(f"Unread count push failed: {str(e)}")
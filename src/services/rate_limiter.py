@@ -0,0 +1,104 @@
+from collections import deque
+from src.database.redis import get_redis
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+import time
+
+# Sliding-window log over every window in one atomic step.
+# KEYS: one sorted set per window
+# ARGV: now_ms, member, then (window_ms, limit) for each key
+# Returns 0 when the hit was recorded, otherwise the 1-based index of the
+# window whose limit was reached (nothing is recorded in that case).
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[1 + i * 2])
+    local limit = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        return i
+    end
+end
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[1 + i * 2])
+    redis.call('ZADD', key, now, member)
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter enforcing several windows at once.
+    With Redis, the check and the increment for all windows run as one
+    atomic script shared by every worker; without it, an in-process
+    log is used.
+    """
+    def __init__(self, namespace: str, windows: List[Tuple[str, int, int]]):
+        # windows: (name, window_seconds, limit)
+        self.namespace = namespace
+        self.windows = windows
+        self._script = None
+        self._script_client = None
+        # Logs are dropped once empty, so idle keys do not accumulate
+        self._local: Dict[Tuple[str, str], deque] = {}
+        self._next_sweep = 0.0
+
+    async def hit(self, key: str) -> Optional[str]:
+        """
+        Record one request for key.
+        Returns None if allowed, or the name of the window that is exhausted.
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                return await self._hit_redis(client, key)
+            except Exception as e:
+                print(f"Redis rate limiter failed, using in-process limiter: {str(e)}")
+
+        return self._hit_local(key)
+
+    async def _hit_redis(self, client, key: str) -> Optional[str]:
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = client
+
+        now_ms = int(time.time() * 1000)
+        keys = [f"{self.namespace}:{{{key}}}:{name}" for name, _, _ in self.windows]
+        args = [now_ms, f"{now_ms}-{uuid4().hex}"]
+        for _, seconds, limit in self.windows:
+            args.extend([seconds * 1000, limit])
+
+        exceeded = await self._script(keys=keys, args=args)
+        return self.windows[exceeded - 1][0] if exceeded else None
+
+    def _sweep(self, now: float):
+        # Keys that are never hit again are only found by a full pass,
+        # run at most once per longest window
+        seconds_by_name = {name: seconds for name, seconds, _ in self.windows}
+        for log_key, log in list(self._local.items()):
+            if log[-1] <= now - seconds_by_name[log_key[1]]:
+                del self._local[log_key]
+        self._next_sweep = now + max(seconds_by_name.values())
+
+    def _hit_local(self, key: str) -> Optional[str]:
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        for name, seconds, limit in self.windows:
+            log = self._local.get((key, name))
+            if log is None:
+                continue
+            while log and log[0] <= now - seconds:
+                log.popleft()
+            if not log:
+                del self._local[(key, name)]
+            elif len(log) >= limit:
+                return name
+
+        for name, _, _ in self.windows:
+            self._local.setdefault((key, name), deque()).append(now)
+
+        return None
@@ -0,0 +1,270 @@
+from src.config import settings
+from src.database.repository import get_admin_db
+from src.services.cache import TTLCache
+from src.services.embeddings import EmbeddingProvider, create_embedding_provider
+from typing import Dict, List, Optional, Set
+import asyncio
+import hashlib
+import json
+import numpy as np
+
+MAX_RESULTS = 3
+
+def issue_text(title: str, description: Optional[str]) -> str:
+    return f"{title}\n\n{description or ''}".strip()
+
+class ProjectVectors:
+    """
+    Embedding matrix for one project's live issues, one row per issue.
+    """
+    def __init__(self):
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.matrix: Optional[np.ndarray] = None
+
+    def upsert(self, issue_id: str, title: str, vector: np.ndarray):
+        if self.matrix is not None and self.matrix.shape[1] != vector.shape[0]:
+            # The provider changed; rows come back as they are re-embedded
+            self.__init__()
+
+        position = self.positions.get(issue_id)
+        if position is not None:
+            self.titles[position] = title
+            self.matrix[position] = vector
+            return
+
+        self.positions[issue_id] = len(self.ids)
+        self.ids.append(issue_id)
+        self.titles.append(title)
+        if self.matrix is None:
+            self.matrix = vector.reshape(1, -1).copy()
+        else:
+            self.matrix = np.vstack([self.matrix, vector])
+
+    def remove(self, issue_id: str):
+        position = self.positions.pop(issue_id, None)
+        if position is None:
+            return
+
+        del self.ids[position]
+        del self.titles[position]
+        self.matrix = np.delete(self.matrix, position, axis=0)
+        self.positions = {issue_id: i for i, issue_id in enumerate(self.ids)}
+
+    def top_k(self, query: np.ndarray, k: int, threshold: float) -> List[Dict]:
+        if not self.ids or self.matrix.shape[1] != query.shape[0]:
+            return []
+
+        # Rows and query are unit vectors, so the dot product is the cosine
+        scores = self.matrix @ query
+        k = min(k, len(self.ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "id": self.ids[i],
+                "title": self.titles[i],
+                "similarity": round(float(scores[i]) * 100, 2)
+            }
+            for i in top
+            if scores[i] >= threshold
+        ]
+
+class SemanticIndex:
+    """
+    Embedding index for semantic duplicate detection. Issues are embedded
+    from title + description when written: the issue endpoints enqueue
+    them and a background task embeds queued issues in batches and stores
+    the vectors in issue_embeddings. Vectors are cached by content hash,
+    so unchanged text is never embedded twice. Each worker keeps a
+    per-project matrix, loaded from the table on first lookup; issues
+    whose stored vector is missing or stale are embedded at that point.
+    """
+    def __init__(self, provider: Optional[EmbeddingProvider] = None):
+        self.provider = provider
+        self.projects = TTLCache(
+            maxsize=settings.DUPLICATE_INDEX_PROJECTS,
+            ttl=settings.DUPLICATE_INDEX_TTL
+        )
+        self.vectors = TTLCache(
+            maxsize=settings.EMBEDDING_CACHE_SIZE,
+            ttl=settings.AI_CACHE_TTL
+        )
+        self._builds: Dict[str, asyncio.Task] = {}
+        # Issues deleted since the queue was last empty
+        self._removed: Set[str] = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def content_hash(self, text: str) -> str:
+        payload = json.dumps([self.provider.model, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, calling the provider only for content not seen before.
+        """
+        hashes = [self.content_hash(text) for text in texts]
+
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            vector = self.vectors.get(content_hash)
+            if vector is not None:
+                found[content_hash] = vector
+            else:
+                missing[content_hash] = text
+
+        pending = list(missing.items())
+        batch_size = min(settings.EMBEDDING_BATCH_SIZE, self.provider.max_batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            vectors = await self.provider.embed([text for _, text in batch])
+            for (content_hash, _), vector in zip(batch, vectors):
+                self.vectors.set(content_hash, vector)
+                found[content_hash] = vector
+
+        return np.stack([found[content_hash] for content_hash in hashes])
+
+    async def _embed_issues(self, issues: List[dict]) -> np.ndarray:
+        """
+        Embed issues and store their vectors.
+        """
+        texts = [issue_text(issue["title"], issue.get("description")) for issue in issues]
+        vectors = await self.embed_texts(texts)
+
+        db = get_admin_db()
+        await db.table("issue_embeddings").upsert([
+            {
+                "issue_id": issue["id"],
+                "project_id": issue["project_id"],
+                "content_hash": self.content_hash(text),
+                "model": self.provider.model,
+                "embedding": vector.tolist(),
+                "updated_at": "now()"
+            }
+            for issue, text, vector in zip(issues, texts, vectors)
+        ]).execute()
+
+        return vectors
+
+    async def _build(self, project_id: str) -> ProjectVectors:
+        db = get_admin_db()
+        issues = await db.table("issues").select(
+            "id, project_id, title, description, issue_embeddings(content_hash, embedding)"
+        ).eq("project_id", project_id).is_("deleted_at", "null").execute()
+
+        index = ProjectVectors()
+        stale = []
+        for issue in issues.data:
+            stored = issue.get("issue_embeddings")
+            if isinstance(stored, list):
+                stored = stored[0] if stored else None
+
+            content_hash = self.content_hash(issue_text(issue["title"], issue.get("description")))
+            if stored and stored["content_hash"] == content_hash:
+                vector = np.array(stored["embedding"], dtype=np.float32)
+                self.vectors.set(content_hash, vector)
+                index.upsert(issue["id"], issue["title"], vector)
+            else:
+                stale.append(issue)
+
+        # Issues written before indexing started, or whose write-time embedding failed
+        if stale:
+            vectors = await self._embed_issues(stale)
+            for issue, vector in zip(stale, vectors):
+                index.upsert(issue["id"], issue["title"], vector)
+
+        self.projects.set(project_id, index)
+        return index
+
+    async def _get(self, project_id: str) -> ProjectVectors:
+        index = self.projects.get(project_id)
+        if index is not None:
+            return index
+
+        # Concurrent lookups on a cold project share one build
+        task = self._builds.get(project_id)
+        if task is None:
+            task = asyncio.ensure_future(self._build(project_id))
+            self._builds[project_id] = task
+            task.add_done_callback(lambda _: self._builds.pop(project_id, None))
+        return await asyncio.shield(task)
+
+    async def find_similar(self, project_id, text: str) -> List[Dict]:
+        index = await self._get(str(project_id))
+        query = (await self.embed_texts([text]))[0]
+        return index.top_k(query, MAX_RESULTS, settings.EMBEDDING_SIMILARITY_THRESHOLD)
+
+    def enqueue(self, issue: dict):
+        """
+        Queue a created or edited issue for embedding.
+        """
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(issue)
+        except asyncio.QueueFull:
+            # Picked up when its project index is next built
+            print(f"Embedding queue full, deferring issue {issue['id']}")
+
+    def remove(self, project_id, issue_id):
+        if self._queue is not None:
+            # Keeps a queued or in-flight embedding from adding it back
+            self._removed.add(str(issue_id))
+        index: Optional[ProjectVectors] = self.projects.get(str(project_id))
+        if index is not None:
+            index.remove(str(issue_id))
+
+    async def _run(self):
+        while True:
+            issue = await self._queue.get()
+
+            # Drain whatever else is waiting into the same batch, latest write wins
+            batch = {issue["id"]: issue}
+            while len(batch) < settings.EMBEDDING_BATCH_SIZE and not self._queue.empty():
+                issue = self._queue.get_nowait()
+                batch[issue["id"]] = issue
+
+            issues = [issue for issue in batch.values() if str(issue["id"]) not in self._removed]
+            try:
+                vectors = await self._embed_issues(issues) if issues else []
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Embedding indexing failed: {str(e)}")
+                vectors = []
+
+            for issue, vector in zip(issues, vectors):
+                if str(issue["id"]) in self._removed:
+                    # Deleted while its batch was being embedded
+                    continue
+                index: Optional[ProjectVectors] = self.projects.get(str(issue["project_id"]))
+                if index is not None:
+                    index.upsert(str(issue["id"]), issue["title"], vector)
+
+            # Nothing queued or in flight can refer to these any more
+            if self._queue.empty():
+                self._removed.clear()
+
+    def start(self):
+        if self._task is None:
+            if self.provider is None:
+                self.provider = create_embedding_provider()
+            self._queue = asyncio.Queue(maxsize=settings.EMBEDDING_QUEUE_SIZE)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._queue = None
+            self._removed.clear()
+
+semantic_index = SemanticIndex()
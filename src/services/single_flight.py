@@ -0,0 +1,59 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+# Every SingleFlight by name, for /metrics
+_flights: Dict[str, "SingleFlight"] = {}
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller starts
+    the operation and later callers await the same result (or exception)
+    instead of starting their own. Nothing is kept once it finishes.
+    The operation is cancelled only when every caller waiting on it has
+    gone away.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        _flights[name] = self
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, operation: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(operation()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def stats(self) -> dict:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls)
+        }
+
+def get_single_flight_stats() -> dict:
+    return {name: flight.stats() for name, flight in _flights.items()}
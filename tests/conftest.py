@@ -0,0 +1,8 @@
+import os
+
+# Settings require these; tests never reach a real Supabase project
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+os.environ.setdefault("SUPABASE_KEY", "anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "service-key")
+os.environ.setdefault("RESEND_API_KEY", "re_test")
+os.environ.setdefault("FROM_EMAIL", "test@example.com")
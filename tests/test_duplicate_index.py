@@ -0,0 +1,39 @@
+import random
+
+from src.services.duplicate_index import ProjectIndex, similarity, tokenize
+
+WORDS = (
+    "login page crash error button save profile upload image fails timeout "
+    "api dashboard slow render mobile layout broken email notification missing"
+).split()
+
+
+def test_matches_exhaustive_scan():
+    rng = random.Random(7)
+    issues = {f"i{n}": " ".join(rng.sample(WORDS, rng.randint(2, 6))) for n in range(200)}
+    index = ProjectIndex()
+    for issue_id, title in issues.items():
+        index.add(issue_id, title)
+
+    for query in list(issues.values())[:50]:
+        expected = sorted(
+            (
+                round(similarity(tokenize(query), tokenize(title)) * 100, 2)
+                for title in issues.values()
+                if similarity(tokenize(query), tokenize(title)) > 0.5
+            ),
+            reverse=True
+        )[:3]
+        assert [r["similarity"] for r in index.query(query)] == expected
+
+
+def test_updates_and_removals_are_reflected():
+    index = ProjectIndex()
+    index.add("a", "Login page crashes on Safari")
+
+    index.add("a", "Add dark mode")
+    assert index.query("login page crashes") == []
+
+    index.remove("a")
+    assert index.query("add dark mode") == []
+    assert index.postings == {}
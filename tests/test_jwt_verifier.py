@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.services import jwt_verifier as jwt_verifier_module
+from src.services.jwt_verifier import JWTVerifier, TokenVerificationError
+
+
+def make_rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def public_jwk(private_key, kid: str) -> dict:
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+def sign(private_key, kid: str, **claims) -> str:
+    payload = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 60}
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def load_stub_jwks(monkeypatch, verifier: JWTVerifier, keys: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == verifier.jwks_url
+        return httpx.Response(200, json={"keys": keys})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        jwt_verifier_module.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    asyncio.run(verifier.refresh_jwks())
+
+
+def test_rs256_token_verifies_against_jwks(monkeypatch):
+    private_key = make_rsa_key()
+    verifier = JWTVerifier()
+    load_stub_jwks(monkeypatch, verifier, [public_jwk(private_key, "key-1")])
+
+    claims = verifier.verify(sign(private_key, "key-1"))
+
+    assert claims["sub"] == "user-1"
+
+
+def test_rs256_token_signed_by_other_key_is_rejected(monkeypatch):
+    verifier = JWTVerifier()
+    load_stub_jwks(monkeypatch, verifier, [public_jwk(make_rsa_key(), "key-1")])
+
+    with pytest.raises(TokenVerificationError):
+        verifier.verify(sign(make_rsa_key(), "key-1"))
+
+
+def test_unknown_kid_falls_back(monkeypatch):
+    private_key = make_rsa_key()
+    verifier = JWTVerifier()
+    load_stub_jwks(monkeypatch, verifier, [public_jwk(private_key, "key-1")])
+
+    assert verifier.verify(sign(private_key, "key-2")) is None
@@ -0,0 +1,21 @@
+import pytest
+from fastapi import HTTPException
+
+from src.api.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_trimmed_fractional_seconds():
+    # PostgREST drops trailing zeros from the fraction
+    row = {"created_at": "2024-01-01T00:00:00.12345+00:00", "id": "00000000-0000-0000-0000-000000000001"}
+
+    created_at, row_id = decode_cursor(encode_cursor(row))
+
+    assert created_at == "2024-01-01T00:00:00.123450+00:00"
+    assert row_id == row["id"]
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+
+    assert exc.value.status_code == 400
@@ -0,0 +1,62 @@
+import asyncio
+
+import numpy as np
+
+from src.services.embeddings import HashingEmbedder
+from src.services.semantic_index import ProjectVectors, SemanticIndex
+
+
+def embed(texts):
+    return asyncio.run(HashingEmbedder(64).embed(texts))
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(64)
+        self.calls = []
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        return await super().embed(texts)
+
+
+def test_upsert_remove_and_top_k():
+    titles = ["Login page crashes", "Dark mode toggle", "Export issues to CSV"]
+    vectors = embed(titles)
+    index = ProjectVectors()
+    for n, (title, vector) in enumerate(zip(titles, vectors)):
+        index.upsert(f"i{n}", title, vector)
+
+    top = index.top_k(vectors[1], 3, threshold=-1.0)
+    assert top[0]["id"] == "i1"
+    assert top[0]["similarity"] == 100.0
+    assert len(top) == 3
+
+    # Only the exact match clears a threshold this high
+    assert [r["id"] for r in index.top_k(vectors[1], 3, threshold=0.99)] == ["i1"]
+
+    # Rows after a removed one move up and keep their own vectors
+    index.remove("i0")
+    assert index.ids == ["i1", "i2"]
+    assert index.positions == {"i1": 0, "i2": 1}
+    assert index.matrix.shape == (2, 64)
+    assert index.top_k(vectors[2], 1, threshold=0.99)[0]["id"] == "i2"
+    assert index.top_k(vectors[0], 3, threshold=0.99) == []
+
+    # Upserting an existing issue replaces its row in place
+    index.upsert("i1", "Login page crashes", vectors[0])
+    assert index.ids == ["i1", "i2"]
+    assert index.top_k(vectors[0], 1, threshold=0.99)[0]["title"] == "Login page crashes"
+
+
+def test_embed_texts_only_sends_unseen_content():
+    provider = CountingEmbedder()
+    index = SemanticIndex(provider)
+
+    first = asyncio.run(index.embed_texts(["alpha", "beta", "alpha"]))
+    assert provider.calls == [["alpha", "beta"]]
+    assert np.allclose(first[0], first[2])
+
+    second = asyncio.run(index.embed_texts(["beta", "gamma"]))
+    assert provider.calls == [["alpha", "beta"], ["gamma"]]
+    assert np.allclose(second[0], first[1])
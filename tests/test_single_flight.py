@@ -0,0 +1,108 @@
+import asyncio
+
+from src.services.single_flight import SingleFlight
+
+
+class Operation:
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_callers_share_one_execution():
+    async def run():
+        flight = SingleFlight("test-share")
+        operation = Operation()
+        waiters = [asyncio.ensure_future(flight.do("k", operation)) for _ in range(10)]
+        await asyncio.sleep(0)
+        operation.release.set()
+        return flight, operation, await asyncio.gather(*waiters)
+
+    flight, operation, results = asyncio.run(run())
+    assert results == ["done"] * 10
+    assert operation.calls == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_cancelling_one_waiter_keeps_the_others_result():
+    async def run():
+        flight = SingleFlight("test-cancel-one")
+        operation = Operation()
+        first = asyncio.ensure_future(flight.do("k", operation))
+        second = asyncio.ensure_future(flight.do("k", operation))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        operation.release.set()
+        return first, operation, await second
+
+    first, operation, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == "done"
+    assert not operation.cancelled
+
+
+def test_cancelling_every_waiter_cancels_the_operation():
+    async def run():
+        flight = SingleFlight("test-cancel-all")
+        operation = Operation()
+        waiters = [asyncio.ensure_future(flight.do("k", operation)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight, operation
+
+    flight, operation = asyncio.run(run())
+    assert operation.cancelled
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_exception_reaches_every_waiter():
+    async def run():
+        flight = SingleFlight("test-error")
+        operation = Operation(error=ValueError("provider down"))
+        waiters = [asyncio.ensure_future(flight.do("k", operation)) for _ in range(3)]
+        await asyncio.sleep(0)
+        operation.release.set()
+        return operation, await asyncio.gather(*waiters, return_exceptions=True)
+
+    operation, results = asyncio.run(run())
+    assert operation.calls == 1
+    assert all(isinstance(r, ValueError) and str(r) == "provider down" for r in results)
+
+
+def test_key_is_forgotten_after_completion():
+    async def run():
+        flight = SingleFlight("test-forget")
+        first = Operation(result="first")
+        first.release.set()
+        assert await flight.do("k", first) == "first"
+        assert flight._calls == {}
+
+        # A later call runs the operation again instead of reusing the result
+        second = Operation(result="second")
+        second.release.set()
+        assert await flight.do("k", second) == "second"
+        assert flight._calls == {}
+        return flight
+
+    flight = asyncio.run(run())
+    assert flight.stats() == {"executions": 2, "coalesced": 0, "in_flight": 0}